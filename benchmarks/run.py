@@ -0,0 +1,218 @@
+"""Offline microbenchmarks for the validators and core data structures.
+
+Run from the repository root::
+
+    python -m benchmarks.run                          # print results
+    python -m benchmarks.run -o results.json          # also save them
+    python -m benchmarks.run --compare results.json   # fail if anything got slower than the saved run
+
+Results are reported as the time per operation in microseconds (best of several repeats) and saved as JSON. A
+benchmark that raises is reported as an error and left out of the results, without stopping the others.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+from typing import Callable, Dict, Optional, Tuple
+
+from . import stubs
+
+BENCHMARKS: Dict[str, Tuple[Callable[[], Callable[[], None]], int]] = {}
+
+
+def benchmark(name: str, ops: int):
+    """Register a benchmark. The decorated function sets up state and returns a callable doing ``ops`` operations."""
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, ops)
+        return setup
+    return decorator
+
+
+@benchmark('domain.validate', ops=1000)
+def domain_validate():
+    from validators.domain.domain import DomainValidator
+    validator = DomainValidator(stubs.StubReddit())
+    submissions = stubs.random_submissions(1000)
+
+    def run():
+        for submission in submissions:
+            validator.validate(submission)
+    return run
+
+
+@benchmark('youtube.get_id', ops=len(stubs.URLS) * 100)
+def youtube_get_id():
+    from validators.promotion.promotion import YoutubeValidator
+    urls = stubs.URLS * 100
+
+    def run():
+        for url in urls:
+            YoutubeValidator.get_id(url)
+    return run
+
+
+@benchmark('promotion.validate', ops=1000)
+def promotion_validate():
+    from validators.promotion.promotion import PromotionValidator
+    reddit = stubs.StubReddit()
+    validator = stubs.make_validator(PromotionValidator, reddit, 'promotion')
+    validator.youtube.config = validator.config
+    submissions = stubs.random_submissions(1000)
+
+    def run():
+        for submission in submissions:
+            validator.validate(submission)
+    return run
+
+
+@benchmark('epic.has_comment', ops=1000)
+def epic_has_comment():
+    from validators.epic.epic import EpicValidator
+    validator = stubs.make_validator(EpicValidator, stubs.StubReddit(), 'epic')
+    submissions = stubs.random_submissions(10)
+    comments = [stubs.comment(submissions[i % 10]) for i in range(1000)]
+    for comment in comments[:200]:
+        validator._comment_store[comment.id] = comment.submission_id
+
+    def run():
+        for comment in comments:
+            validator.has_comment(comment)
+    return run
+
+
+@benchmark('epic.num_epic_comments', ops=1000)
+def epic_num_epic_comments():
+    from validators.epic.epic import EpicValidator
+    validator = stubs.make_validator(EpicValidator, stubs.StubReddit(), 'epic')
+    submissions = stubs.random_submissions(10)
+    for i in range(200):
+        validator._comment_store[stubs.new_id()] = submissions[i % 10].id
+
+    def run():
+        for i in range(1000):
+            validator.num_epic_comments(submissions[i % 10].id)
+    return run
+
+
+@benchmark('BoundedCache.setitem', ops=10000)
+def bounded_cache():
+    from reddit.cache import BoundedCache
+    store = BoundedCache('benchmark', max_items=20)
+    keys = [stubs.new_id() for _ in range(10000)]
+
+    def run():
+        for key in keys:
+            store[key] = key
+    return run
+
+
+@benchmark('flair.process[10k watched]', ops=10000)
+def flair_process():
+    from validators.flair.flair import FlairValidator, WatchedSubmission
+    validator = stubs.make_validator(FlairValidator, stubs.StubReddit(), 'flair')
+    watched = [WatchedSubmission(stubs.new_id(), time.time() + 3600, False) for _ in range(10000)]
+    for submission in watched:
+        validator._store[submission.id] = submission
+
+    def run():
+        validator.process()
+    return run
+
+
+@benchmark('core.check_submission[10 validators]', ops=1000)
+def core_check_submission():
+    from reddit.enums import Action, Rule
+    from reddit.guard import ValidatorGuard
+    from reddit.reddit import Reddit
+
+    class PassValidator:
+        def dlog(self, message):
+            pass
+
+        def validate(self, submission):
+            return Action.PASS, Rule.NONE
+
+        def decided(self, submission, outcome):
+            pass
+
+    reddit = stubs.StubReddit()
+    bot = Reddit.__new__(Reddit)
+    bot.log = reddit.log
+    bot.journal = None
+    bot.guard = ValidatorGuard(reddit.config, reddit.log)
+    bot.extensions = {'SUBMISSION': [PassValidator() for _ in range(10)], 'COMMENT': []}
+    submissions = stubs.random_submissions(1000)
+
+    def run():
+        for submission in submissions:
+            bot.check_submission(submission)
+    return run
+
+
+def measure(setup, ops: int, repeat: int) -> Dict[str, float]:
+    timer = timeit.Timer(setup())
+    number, _ = timer.autorange()
+    times = [t / number / ops * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {'us_per_op': min(times), 'us_per_op_mean': sum(times) / len(times), 'ops': ops * number}
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float,
+            errors: Optional[Dict[str, str]] = None) -> bool:
+    ok = True
+    for name in baseline:
+        if name in (errors or {}):  # Ran before, fails now
+            ok = False
+            print(f'    {name:<40} {baseline[name]["us_per_op"]:10.3f} -> ERROR')
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['us_per_op'], result['us_per_op']
+        change = (after - before) / before
+        flag = 'REGRESSION' if change > threshold else ''
+        ok = ok and not flag
+        print(f'    {name:<40} {before:10.3f} -> {after:10.3f} us/op ({change:+7.1%}) {flag}')
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description='Run the offline benchmarks.')
+    parser.add_argument('-o', '--output', help='Save results as JSON to this file.')
+    parser.add_argument('-k', '--filter', default='', help='Only run benchmarks whose name contains this.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Repeats per benchmark, the best one is kept.')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare against.')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Slowdown (fraction) above which a benchmark counts as a regression.')
+    args = parser.parse_args(argv)
+
+    results, errors = {}, {}
+    for name, (setup, ops) in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+
+        try:
+            results[name] = measure(setup, ops, args.repeat)
+        except Exception as error:
+            errors[name] = f'{type(error).__name__}: {error}'
+            print(f'{name:<44} ERROR {errors[name]}')
+        else:
+            print(f'{name:<44} {results[name]["us_per_op"]:10.3f} us/op')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(), 'platform': platform.platform(), 'time': time.time(),
+                'results': results, 'errors': errors
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        print(f'\nCompared to {args.compare}:')
+        if not compare(results, baseline, args.threshold, errors):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
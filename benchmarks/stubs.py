@@ -0,0 +1,105 @@
+"""Offline stand-ins for the items, bot instance and external APIs the validators expect."""
+import configparser
+import itertools
+import logging
+import os
+import random
+
+from reddit.snapshot import CommentSnapshot, SubmissionSnapshot
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_ids = itertools.count(1)
+
+
+def new_id() -> str:
+    return format(next(_ids), 'x').rjust(6, '0')
+
+
+def submission(url='', is_self=False, title='Title', selftext='', created_utc=0.0, link_flair_text=None):
+    item_id = new_id()
+    return SubmissionSnapshot.from_data(dict(
+        id=item_id, name='t3_' + item_id, author='author', created_utc=created_utc,
+        permalink=f'/r/FortNiteBR/comments/{item_id}/', title=title, selftext=selftext, url=url, is_self=is_self,
+        link_flair_text=link_flair_text
+    ))
+
+
+def comment(parent: SubmissionSnapshot, body='Comment', author_flair_css_class=None):
+    item_id = new_id()
+    return CommentSnapshot.from_data(dict(
+        id=item_id, name='t1_' + item_id, author='author', created_utc=parent.created_utc,
+        permalink=parent.permalink + item_id + '/', body=body, link_id=parent.fullname,
+        author_flair_css_class=author_flair_css_class
+    ))
+
+
+class StubResponse:
+    __slots__ = ['status_code', '_json']
+
+    def __init__(self, json, status_code=200):
+        self.status_code = status_code
+        self._json = json
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def json(self):
+        return self._json
+
+
+class StubHttp:
+    """Answers YouTube and PushShift requests with canned responses."""
+    YOUTUBE = {'items': [{'contentDetails': {'duration': 'PT1M30S'}}]}
+    PUSHSHIFT = {'aggs': {'subreddit': [{'doc_count': 4}, {'doc_count': 3}]}}
+
+    def get(self, url, **kwargs):
+        return StubResponse(self.YOUTUBE if 'googleapis' in url else self.PUSHSHIFT)
+
+
+class StubScheduler:
+    def register_job(self, job_id, interval, action, logger):
+        pass
+
+
+class StubReddit:
+    """Just enough of :class:`reddit.reddit.Reddit` for validators to be constructed without logging in."""
+
+    def __init__(self):
+        self.config = configparser.ConfigParser()
+        self.config.read(os.path.join(ROOT, 'reddit', 'config.example.ini'))
+        if not self.config.has_section('logging'):
+            self.config.read_dict({'logging': {'log_level': 'CRITICAL', 'type': ''}})
+        self.log = logging.getLogger('reddit.benchmarks')
+        self.log.disabled = True
+        self.reddit = None
+        self.scheduler = StubScheduler()
+        self.http = StubHttp()
+
+
+def make_validator(cls, reddit: StubReddit, name: str):
+    """Construct a validator and load the example configuration of the validator package ``name``."""
+    validator = cls(reddit)
+    validator.config.read(os.path.join(ROOT, 'validators', name, 'config.example.ini'))
+    return validator
+
+
+URLS = [
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+    'https://youtu.be/dQw4w9WgXcQ',
+    'https://m.youtube.com/watch?v=dQw4w9WgXcQ&feature=share',
+    'https://gfycat.com/HappyBlueDog',
+    'https://clips.twitch.tv/FunnySlug',
+    'https://www.twitch.tv/ninja',
+    'https://twitter.com/FortniteGame/status/1',
+    'https://v.redd.it/abcdef',
+    'https://example.com/article',
+]
+
+
+def random_submissions(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [submission(url=rng.choice(URLS), is_self=rng.random() < 0.2) for _ in range(count)]
@@ -0,0 +1,142 @@
+import threading
+import time
+from enum import IntEnum
+from typing import List, Optional, Tuple
+
+import praw
+
+
+class Priority(IntEnum):
+    """Request classes in order of importance. Lower classes are never held back for higher ones."""
+    STREAM = 0
+    REMOVAL = 1
+    METADATA = 2
+    BACKGROUND = 3
+
+
+class RateBudget:
+    """Shares the Reddit API rate limit between the bot's request classes.
+
+    Reddit reports the requests left in the current window through rate limit headers, which PRAW keeps on its
+    rate limiter. Each :class:`Priority` has a reserve, the number of requests it must leave untouched for more
+    important classes. Callers ask for a PRAW instance before making requests and are held back while their class
+    is over budget, so background jobs back off long before the live streams run out of requests.
+
+    Newer prawcore versions do not keep the time the window resets, so it is estimated as one window after the first
+    response of the current window was seen (a window starts over when Reddit reports fewer used requests). A caller
+    is never held back longer than ``max_wait`` seconds: after that it is let through, so its request refreshes the
+    rate limit headers even if the estimate is off.
+
+    Read-only traffic may also be spread over extra credentials configured as ``[reddit:<name>]`` sections.
+
+    Parameters
+    ----------
+    reddit: praw.Reddit
+        The authorized PRAW instance used for streams and moderation.
+    config: configparser.ConfigParser
+        The bot configuration. Reserves are read from the optional ``[budget]`` section.
+    logger: logging.Logger
+        Logger used to report when a request class is held back.
+    """
+    __slots__ = ['reddit', 'readers', 'reserves', 'max_wait', 'granted', 'held', 'log', '_windows', '_lock']
+
+    def __init__(self, reddit: praw.Reddit, config, logger):
+        self.reddit = reddit
+        self.log = logger
+        self.reserves = {
+            Priority.STREAM: 0,
+            Priority.REMOVAL: config.getint('budget', 'removal', fallback=20),
+            Priority.METADATA: config.getint('budget', 'metadata', fallback=100),
+            Priority.BACKGROUND: config.getint('budget', 'background', fallback=250),
+        }
+        self.max_wait = config.getfloat('budget', 'max_wait', fallback=60.0)
+        self.granted = {priority: 0 for priority in Priority}
+        self.held = {priority: 0 for priority in Priority}
+        self._windows = {}  # id(instance) -> (requests used, time the window was first seen)
+        self._lock = threading.Lock()
+
+        self.readers = [reddit]
+        for section in config.sections():
+            if not section.startswith('reddit:'):
+                continue
+
+            info = dict(config.items(section))
+            self.readers.append(praw.Reddit(
+                client_id=info['client_id'], client_secret=info['client_secret'], user_agent=info['user_agent']
+            ))
+            self.log.info(f'[Budget] Added read-only credential: {section.split(":", 1)[1]}')
+
+    def limits(self, instance: praw.Reddit) -> Tuple[Optional[float], Optional[float]]:
+        """Get the requests remaining and the time the window resets for a PRAW instance, if known."""
+        limiter = getattr(getattr(instance, '_core', None), '_rate_limiter', None)
+        remaining, used = getattr(limiter, 'remaining', None), getattr(limiter, 'used', None)
+        reset = getattr(limiter, 'reset_timestamp', None)  # Only kept by prawcore < 2.4
+        if reset is None and used is not None:
+            reset = self._window_end(instance, used, getattr(limiter, 'window_size', 600))
+        return remaining, reset
+
+    def _window_end(self, instance: praw.Reddit, used: int, window_size: float) -> float:
+        with self._lock:
+            seen = self._windows.get(id(instance))
+            if seen is None or used < seen[0]:
+                seen = (used, time.time())  # First response of a new window
+            else:
+                seen = (used, seen[1])
+            self._windows[id(instance)] = seen
+        # The window started before its first response was seen, so this is the latest it can reset
+        return seen[1] + window_size
+
+    def headroom(self, instance: praw.Reddit, priority: Priority) -> float:
+        remaining, reset = self.limits(instance)
+        if remaining is None or (reset is not None and reset <= time.time()):
+            return float('inf')  # No headers seen yet or the window already reset
+        return remaining - self.reserves[priority]
+
+    def _wait(self, instances: List[praw.Reddit], priority: Priority) -> praw.Reddit:
+        warned = False
+        deadline = time.time() + self.max_wait
+        while True:
+            instance = max(instances, key=lambda i: self.headroom(i, priority))
+            if self.headroom(instance, priority) > 0:
+                with self._lock:
+                    self.granted[priority] += 1
+                return instance
+
+            if time.time() >= deadline:
+                self.log.warning(f'[Budget] Held back {priority.name.lower()} requests for {self.max_wait:g} seconds, '
+                                 f'letting one through to refresh the rate limit.')
+                with self._lock:
+                    self.granted[priority] += 1
+                return instance
+
+            if not warned:
+                self.log.debug(f'[Budget] Holding back {priority.name.lower()} requests until the rate limit resets.')
+                with self._lock:
+                    self.held[priority] += 1
+                warned = True
+
+            resets = [reset for reset in (self.limits(i)[1] for i in instances) if reset is not None]
+            time.sleep(min(max(min(resets, default=0) - time.time(), 0.1), 5.0, max(deadline - time.time(), 0.1)))
+
+    def stats(self) -> dict:
+        """Get the requests granted and the number of times each request class was held back."""
+        with self._lock:
+            return {
+                priority.name.lower(): {'granted': self.granted[priority], 'held': self.held[priority]}
+                for priority in Priority
+            }
+
+    def reader(self, priority: Priority) -> praw.Reddit:
+        """Get the PRAW instance with the most room for a read-only request, waiting while all are over budget.
+
+        Objects fetched from the returned instance may not be authorized for moderation actions.
+        """
+        return self._wait(self.readers, priority)
+
+    def wait(self, priority: Priority):
+        """Wait until the authorized instance is within budget for the request class."""
+        self._wait([self.reddit], priority)
+
+    def writer(self, priority: Priority) -> praw.Reddit:
+        """Get the authorized PRAW instance once the request class is within budget."""
+        return self._wait([self.reddit], priority)
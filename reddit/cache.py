@@ -0,0 +1,146 @@
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Callable, List, Optional
+
+
+def approximate_size(obj) -> int:
+    """Estimate the memory held by an object and the objects directly inside it."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in obj.items())
+    elif isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in obj)
+    else:
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if slot != '__weakref__':
+                    size += sys.getsizeof(getattr(obj, slot, None))
+    return size
+
+
+class BoundedCache(MutableMapping):
+    """Thread-safe mapping that forgets its oldest entries once it grows past its limits.
+
+    Entries are kept in insertion order (setting an existing key moves it to the end) and the oldest are evicted while
+    the cache holds more than ``max_items`` entries or more than ``max_bytes`` bytes, as estimated by ``sizer``.
+    Entries older than ``ttl`` seconds are treated as missing and dropped by :meth:`expire`.
+
+    Every cache registers itself under its name so :mod:`reddit.memory` can report on all of them.
+
+    Parameters
+    ----------
+    name: str
+        Name used in memory reports, i.e ``epic.sticky``.
+    max_items: Optional[int]
+        Maximum number of entries.
+    max_bytes: Optional[int]
+        Maximum estimated size (bytes) of all keys and values.
+    ttl: Optional[float]
+        Time (seconds) after which an entry expires.
+    sizer: Callable
+        Estimates the size of a single key or value.
+    """
+    __slots__ = ['name', 'max_items', 'max_bytes', 'ttl', 'sizer', 'bytes', 'evictions', '_data', '_lock', '__weakref__']
+
+    _instances = weakref.WeakValueDictionary()  # id -> cache, mappings are not hashable
+
+    def __init__(self, name: str, max_items: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, sizer: Callable[[object], int] = approximate_size):
+        self.name = name
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizer = sizer
+        self.bytes = 0
+        self.evictions = 0
+        self._data = OrderedDict()  # key -> (value, size, inserted)
+        self._lock = threading.RLock()
+        BoundedCache._instances[id(self)] = self
+
+    @classmethod
+    def instances(cls) -> List['BoundedCache']:
+        return sorted(cls._instances.values(), key=lambda cache: cache.name)
+
+    def _expired(self, inserted: float) -> bool:
+        return self.ttl is not None and time.time() - inserted > self.ttl
+
+    def __getitem__(self, key):
+        with self._lock:
+            value, _, inserted = self._data[key]
+            if self._expired(inserted):
+                self._remove(key)
+                raise KeyError(key)
+            return value
+
+    def __setitem__(self, key, value):
+        size = self.sizer(key) + self.sizer(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, size, time.time())
+            self.bytes += size
+            while self._data and ((self.max_items is not None and len(self._data) > self.max_items) or
+                                  (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        _, size, _ = self._data.pop(key)
+        self.bytes -= size
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def items(self):
+        """Get a list of (key, value) pairs, oldest first. Safe to use while other threads modify the cache."""
+        with self._lock:
+            return [(key, value) for key, (value, _, inserted) in self._data.items() if not self._expired(inserted)]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def popitem(self, last: bool = True):
+        with self._lock:
+            key, (value, size, _) = self._data.popitem(last=last)
+            self.bytes -= size
+            return key, value
+
+    def expire(self) -> int:
+        """Drop every expired entry. Returns the number dropped."""
+        if self.ttl is None:
+            return 0
+
+        with self._lock:
+            expired = [key for key, (_, _, inserted) in self._data.items() if self._expired(inserted)]
+            for key in expired:
+                self._remove(key)
+            return len(expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'items': len(self._data), 'max_items': self.max_items, 'evictions': self.evictions,
+                'bytes': self.bytes if self.max_bytes is not None else sum(
+                    self.sizer(key) + self.sizer(value) for key, (value, _, _) in self._data.items()
+                ),
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,70 @@
+import re
+from typing import Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+TRACKING_PARAMS = {'feature', 'si', 'ref', 'ref_src', 'ref_url', 'share', 'context', 'fbclid', 'gclid'}
+
+_YOUTUBE_VIDEO_PATHS = ('shorts', 'embed', 'live', 'v', 'e')
+
+_GFYCAT_SUFFIX = re.compile(r'(-size_restricted|-mobile|-max-\d+mb|-small|-\d+px)?\.(gif|webm|mp4|gifv)$', re.I)
+
+
+def youtube_id(url: str) -> Optional[str]:
+    """Extract the video id from a YouTube video url (watch?v=, youtu.be/, embed/, shorts/, live/, v/).
+
+    Returns None for urls that do not point at a single video, such as playlists, searches or channels.
+    """
+    parts = urlparse(url)
+    query_v = parse_qs(parts.query).get('v')
+    if query_v:
+        return query_v[0]
+    path = [part for part in parts.path.split('/') if part]
+    if _host(parts) == 'youtu.be' and path:
+        return path[0]
+    if len(path) >= 2 and path[0] in _YOUTUBE_VIDEO_PATHS:
+        return path[1]
+    return None
+
+
+def _host(parts) -> str:
+    host = parts.netloc.lower().split('@')[-1].split(':')[0]
+    for prefix in ('www.', 'm.', 'mobile.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host
+
+
+def canonical_url(url: str) -> str:
+    """Reduce a url to a key that is the same for every link to the same piece of media.
+
+    Known media hosts map to ``<host>:<media id>`` (i.e ``youtube:dQw4w9WgXcQ``) so youtu.be and youtube.com links,
+    gfycat file variants and clip links compare equal. Other urls are normalised by dropping the scheme, ``www.``,
+    fragments, trailing slashes and tracking parameters.
+    """
+    parts = urlparse(url.strip())
+    host = _host(parts)
+    path = parts.path.rstrip('/')
+    segments = [segment for segment in path.split('/') if segment]
+
+    if host in ('youtube.com', 'youtu.be', 'youtube-nocookie.com', 'music.youtube.com'):
+        if segments and segments[0] in ('channel', 'user', 'c'):
+            return f'youtube-channel:{segments[1] if len(segments) > 1 else ""}'
+        video = youtube_id(url)
+        if video:
+            return f'youtube:{video}'
+    elif host.endswith('gfycat.com') and segments:
+        name = _GFYCAT_SUFFIX.sub('', segments[-1])
+        return f'gfycat:{name.split("-")[0].lower()}'
+    elif host == 'clips.twitch.tv' and segments:
+        return f'twitch-clip:{segments[-1]}'
+    elif host.endswith('twitch.tv') and len(segments) >= 3 and segments[1] == 'clip':
+        return f'twitch-clip:{segments[2]}'
+    elif host == 'streamable.com' and segments:
+        return f'streamable:{segments[-1]}'
+    elif host in ('v.redd.it', 'i.redd.it') and segments:
+        return f'redd.it:{segments[0]}'
+    elif host in ('imgur.com', 'i.imgur.com') and segments:
+        return f'imgur:{segments[-1].split(".")[0]}'
+
+    query = sorted((key, value) for key, value in parse_qs(parts.query).items() if key.lower() not in TRACKING_PARAMS)
+    return host + path + ('?' + urlencode(query, doseq=True) if query else '')
@@ -0,0 +1,195 @@
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised when a request is refused because the circuit for its host is open."""
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures for a single dependency and refuses calls while it is unhealthy.
+
+    The breaker starts *closed* (calls allowed). After ``threshold`` consecutive failures it *opens* and
+    refuses every call until ``reset_time`` seconds have passed, at which point a single trial call is let
+    through (*half-open*). A successful trial closes the breaker again, a failed one re-opens it.
+
+    Parameters
+    ----------
+    name: str
+        Name of the dependency, used for logging.
+    threshold: int
+        Consecutive failures before the breaker opens.
+    reset_time: float
+        Time (seconds) an open breaker waits before allowing a trial call.
+    """
+    __slots__ = ['name', 'threshold', 'reset_time', '_failures', '_opened', '_trial', '_lock']
+
+    def __init__(self, name: str, threshold: int = 5, reset_time: float = 60.0):
+        self.name = name
+        self.threshold = threshold
+        self.reset_time = reset_time
+        self._failures = 0
+        self._opened = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened is None:
+                return 'closed'
+            elif time.time() - self._opened >= self.reset_time:
+                return 'half-open'
+            return 'open'
+
+    def allow(self) -> bool:
+        """Check whether a call may be made right now."""
+        with self._lock:
+            if self._opened is None:
+                return True
+            elif not self._trial and time.time() - self._opened >= self.reset_time:
+                self._trial = True  # Only one trial call at a time while half-open
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened = None
+            self._trial = False
+
+    def release(self):
+        """Give back a call that was allowed but never made, so a half-open breaker can allow another trial."""
+        with self._lock:
+            self._trial = False
+
+    def failure(self) -> bool:
+        """Record a failed call. Returns True if this failure opened the breaker."""
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+            if self._opened is not None or self._failures >= self.threshold:
+                opened = self._opened is None
+                self._opened = time.time()
+                return opened
+            return False
+
+
+class HttpClient:
+    """Shared outbound HTTP client used by validators to talk to external APIs.
+
+    Every request goes through one keep-alive :class:`requests.Session`, is limited per host, bounded by a
+    deadline across all retries, and guarded by a per-host :class:`CircuitBreaker`.
+
+    Parameters
+    ----------
+    config: configparser.ConfigParser
+        The bot configuration. Settings are read from the optional ``[http]`` section.
+    logger: logging.Logger
+        Logger used to report retries and breaker state changes.
+    """
+    __slots__ = [
+        'log', 'session', 'timeout', 'deadline', 'retries', 'backoff', 'host_limit',
+        'breaker_threshold', 'breaker_reset', '_breakers', '_limits', '_lock'
+    ]
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, config, logger):
+        self.log = logger
+        self.timeout = config.getfloat('http', 'timeout', fallback=5.0)
+        self.deadline = config.getfloat('http', 'deadline', fallback=15.0)
+        self.retries = config.getint('http', 'retries', fallback=2)
+        self.backoff = config.getfloat('http', 'backoff', fallback=0.5)
+        self.host_limit = config.getint('http', 'host_limit', fallback=4)
+        self.breaker_threshold = config.getint('http', 'breaker_threshold', fallback=5)
+        self.breaker_reset = config.getfloat('http', 'breaker_reset', fallback=60.0)
+
+        pool_size = config.getint('http', 'pool_size', fallback=10)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._breakers = {}
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(host, self.breaker_threshold, self.breaker_reset)
+            return self._breakers[host]
+
+    def _limit(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._limits:
+                self._limits[host] = threading.BoundedSemaphore(self.host_limit)
+            return self._limits[host]
+
+    def get(self, url: str, deadline: Optional[float] = None, **kwargs) -> requests.Response:
+        """Perform a GET request with retries, backoff and circuit breaking.
+
+        Parameters
+        ----------
+        url: str
+            The URL to request.
+        deadline: Optional[float]
+            Total time (seconds) allowed for the request including retries. Defaults to the configured deadline.
+
+        Returns
+        -------
+        requests.Response
+            The final response. Responses with a non-retryable status are returned as is.
+
+        Raises
+        ------
+        CircuitOpenError
+            The circuit for the host is open and the request was not attempted.
+        requests.RequestException
+            Every attempt failed or the deadline passed.
+        """
+        host = urlparse(url).netloc
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f'Circuit for {host} is open')
+
+        end = time.monotonic() + (deadline if deadline is not None else self.deadline)
+        error = None
+        for attempt in range(self.retries + 1):
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+
+            limit = self._limit(host)
+            if not limit.acquire(timeout=remaining):
+                error = requests.exceptions.Timeout(f'Timed out waiting for a connection to {host}')
+                break
+
+            try:
+                response = self.session.get(url, timeout=(self.timeout, min(self.timeout, remaining)), **kwargs)
+            except requests.RequestException as e:
+                error = e
+            else:
+                if response.status_code not in self.RETRY_STATUS:
+                    breaker.success()
+                    return response
+                error = requests.exceptions.HTTPError(f'{host} responded with {response.status_code}',
+                                                      response=response)
+                response.close()
+            finally:
+                limit.release()
+
+            self.log.debug(f'[HTTP] Attempt {attempt + 1} to {host} failed: {error}')
+            if attempt < self.retries:
+                time.sleep(max(0.0, min(self.backoff * 2 ** attempt, end - time.monotonic())))
+
+        if breaker.failure():
+            self.log.warning(f'[HTTP] Circuit for {host} opened after repeated failures!')
+
+        raise error or requests.exceptions.Timeout(f'Deadline exceeded for request to {host}')
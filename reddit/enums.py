@@ -62,6 +62,18 @@ What counts as promotion?
 You also may also only make one promotional post every 3-4 days and any giveaway must be approved by the moderation team ahead of time.
 """
 
+content = """
+### Prohibited Content
+
+Your submission or comment contains content that is not allowed on this subreddit, such as spam, scam links or slurs.
+"""
+
+repost = """
+### Repost
+
+This link has already been submitted recently. Please check the original submission instead of posting it again.
+"""
+
 
 class Rule(Enum):
     def __str__(self):
@@ -70,6 +82,8 @@ class Rule(Enum):
     FLAIR = flair
     DOMAIN = domain
     PROMOTION = promotion
+    CONTENT = content
+    REPOST = repost
     NONE = 'none'
 
 
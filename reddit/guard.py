@@ -0,0 +1,162 @@
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Tuple
+
+from .client import CircuitBreaker
+from .enums import Action, Rule
+
+
+class ValidatorGuard:
+    """Runs validators under a time budget, isolating the core from validators that hang or raise.
+
+    Each call to ``validate`` runs on a small thread pool and is given up on once its timeout passes. A validator that
+    times out or raises gets its fallback verdict instead, and the fault is counted. A validator that faults
+    ``quarantine_after`` times in a row is quarantined: it is skipped (fallback verdict) for ``quarantine_time``
+    seconds, then given a single trial call, just like an open :class:`CircuitBreaker`.
+
+    A call that times out is cancelled if it has not started yet; that is not the validator's fault (the pool was
+    busy), so it only gets the fallback verdict. A call that already started keeps its pool thread until it finishes
+    on its own. Until it does, the validator counts as *stuck*: it gets its fallback verdict without being called, so
+    a hung validator ties up at most one thread and its late calls can't pile up side effects. Setting a validator's
+    timeout to 0 runs it inline instead: it is still isolated from exceptions, but not bounded in time.
+
+    Parameters
+    ----------
+    config: configparser.ConfigParser
+        The bot configuration. Settings are read from the optional ``[deadlines]`` section, where
+        ``<name>_timeout`` and ``<name>_fallback`` override the defaults for a single validator (``<name>`` being the
+        class name without the Validator suffix, i.e ``promotion_timeout``).
+    logger: logging.Logger
+        Logger used to report faults and quarantines.
+    """
+    __slots__ = ['config', 'log', 'timeout', 'fallback', 'quarantine_after', 'quarantine_time', 'timeouts', 'errors',
+                 'quarantined', 'stuck', 'busy', '_limits', '_breakers', '_running', '_pool', '_lock']
+
+    def __init__(self, config, logger):
+        self.config = config
+        self.log = logger
+        self.timeout = config.getfloat('deadlines', 'timeout', fallback=10.0)
+        self.fallback = config.get('deadlines', 'fallback', fallback='MANUAL')
+        self.quarantine_after = config.getint('deadlines', 'quarantine_after', fallback=5)
+        self.quarantine_time = config.getfloat('deadlines', 'quarantine_time', fallback=300.0)
+        self.timeouts = Counter()
+        self.errors = Counter()
+        self.quarantined = Counter()
+        self.stuck = Counter()
+        self.busy = Counter()
+        self._limits = {}
+        self._breakers = {}
+        self._running = {}  # Validator name -> call that timed out and is still running
+        self._pool = ThreadPoolExecutor(config.getint('deadlines', 'threads', fallback=8), 'validator')
+        self._lock = threading.Lock()
+
+        # Reject invalid fallbacks on startup rather than on the first fault
+        fallbacks = [key for key in config.options('deadlines') if key.endswith('_fallback')] \
+            if config.has_section('deadlines') else []
+        for key in [''] + [key[:-len('_fallback')] for key in fallbacks]:
+            self.limits(key)
+
+    @staticmethod
+    def key(name: str) -> str:
+        return name[:-len('Validator')].lower() if name.endswith('Validator') else name.lower()
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name, self.quarantine_after, self.quarantine_time)
+            return self._breakers[name]
+
+    def limits(self, name: str) -> Tuple[float, Action]:
+        """Get the timeout and fallback action of a validator.
+
+        Raises
+        ------
+        ValueError
+            If the fallback is REMOVE, which would have no rule to give as the removal reason.
+        """
+        if name not in self._limits:
+            key = self.key(name)
+            fallback = Action[self.config.get('deadlines', f'{key}_fallback', fallback=self.fallback).upper()]
+            if fallback == Action.REMOVE:
+                raise ValueError(f'Fallback of {name or "validators"} cannot be REMOVE, there would be no rule to '
+                                 f'give as the removal reason')
+            self._limits[name] = (self.config.getfloat('deadlines', f'{key}_timeout', fallback=self.timeout), fallback)
+        return self._limits[name]
+
+    def _fallback(self, name: str) -> Tuple[Action, Rule]:
+        return self.limits(name)[1], Rule.NONE
+
+    def _fault(self, name: str, breaker: CircuitBreaker):
+        if breaker.failure():
+            self.log.warning(f'[Guard] {name} quarantined for {self.quarantine_time:g} seconds after repeated faults!')
+
+    def _overrun(self, name: str, breaker: CircuitBreaker, future: Future, item, timeout: float) -> Tuple[Action, Rule]:
+        if future.cancel():
+            self.busy[name] += 1
+            breaker.release()
+            self.log.warning(f'[Guard] No thread was free to run {name} on {item.id}, using fallback verdict.')
+            return self._fallback(name)
+
+        with self._lock:
+            self._running[name] = future
+        self.timeouts[name] += 1
+        self.log.warning(f'[Guard] {name} took longer than {timeout:g} seconds on {item.id}, using fallback verdict.')
+        self._fault(name, breaker)
+        return self._fallback(name)
+
+    def validate(self, validator, item) -> Tuple[Action, Rule]:
+        """Run ``validator.validate(item)`` within the validator's time budget.
+
+        Returns
+        -------
+        Action, Rule
+            The validator's verdict, or its fallback verdict if it timed out, raised or is quarantined.
+        """
+        name = type(validator).__name__
+        with self._lock:
+            running = self._running.get(name)
+            if running is not None and running.done():
+                del self._running[name]
+                running = None
+        if running is not None:
+            self.stuck[name] += 1
+            return self._fallback(name)
+
+        breaker = self.breaker(name)
+        if not breaker.allow():
+            self.quarantined[name] += 1
+            return self._fallback(name)
+
+        timeout = self.limits(name)[0]
+        future = None
+        if timeout > 0:
+            future = self._pool.submit(validator.validate, item)
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass  # A TimeoutError here is either the deadline or raised by the validator, done() tells them apart
+            if not future.done():
+                return self._overrun(name, breaker, future, item, timeout)
+
+        try:
+            verdict = future.result() if future is not None else validator.validate(item)
+        except Exception as error:
+            self.errors[name] += 1
+            self.log.error(f'[Guard] {name} raised an exception on {item.id}, using fallback verdict.', exc_info=error)
+            self._fault(name, breaker)
+            return self._fallback(name)
+
+        breaker.success()
+        return verdict
+
+    def stats(self) -> dict:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            name: {
+                'timeouts': self.timeouts[name], 'errors': self.errors[name], 'quarantined': self.quarantined[name],
+                'stuck': self.stuck[name], 'busy': self.busy[name], 'state': breaker.state
+            }
+            for name, breaker in breakers.items()
+        }
@@ -0,0 +1,246 @@
+"""Append-only binary journal of every decision the bot makes.
+
+Records are written as length-prefixed frames into one segment file per (UTC) day. A frame is laid out as::
+
+    uint32  length of the rest of the frame
+    float64 timestamp
+    uint8   kind (0 = submission, 1 = comment)
+    uint8   outcome (Action value)
+    uint8   number of verdicts
+    str8    item id
+    verdict * number of verdicts
+
+where every verdict is ``str8 validator, uint8 action, str8 rule, float32 latency (seconds)`` and ``str8`` is a
+uint8 length followed by that many bytes of UTF-8. Segments are read through :mod:`mmap`, so queries over months of
+history never hold more than one frame in memory at a time.
+
+The module doubles as a command line tool::
+
+    python -m reddit.journal why <id>
+    python -m reddit.journal rates --hours 24
+"""
+import argparse
+import datetime
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import Counter
+from typing import Iterator, List, NamedTuple, Optional
+
+from .enums import Action, Rule
+
+KINDS = ('submission', 'comment')
+
+_LENGTH = struct.Struct('<I')
+_HEADER = struct.Struct('<dBBB')
+_LATENCY = struct.Struct('<f')
+
+
+class Verdict(NamedTuple):
+    validator: str
+    action: Action
+    rule: Rule
+    latency: float
+
+
+class Record(NamedTuple):
+    id: str
+    time: float
+    kind: str
+    outcome: Action
+    verdicts: List[Verdict]
+
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode('utf-8')[:255]
+    return bytes((len(data),)) + data
+
+
+def _unpack_str(buffer, offset: int):
+    size = buffer[offset]
+    return bytes(buffer[offset + 1:offset + 1 + size]).decode('utf-8', 'replace'), offset + 1 + size
+
+
+def encode(record: Record) -> bytes:
+    body = [
+        _HEADER.pack(record.time, KINDS.index(record.kind), record.outcome.value, len(record.verdicts)),
+        _pack_str(record.id)
+    ]
+    for verdict in record.verdicts:
+        body.append(_pack_str(verdict.validator))
+        body.append(bytes((verdict.action.value,)))
+        body.append(_pack_str(verdict.rule.name))
+        body.append(_LATENCY.pack(verdict.latency))
+    body = b''.join(body)
+    return _LENGTH.pack(len(body)) + body
+
+
+def decode(buffer, offset: int) -> Record:
+    timestamp, kind, outcome, count = _HEADER.unpack_from(buffer, offset)
+    item_id, offset = _unpack_str(buffer, offset + _HEADER.size)
+
+    verdicts = []
+    for _ in range(count):
+        validator, offset = _unpack_str(buffer, offset)
+        action = Action(buffer[offset])
+        rule, offset = _unpack_str(buffer, offset + 1)
+        latency, = _LATENCY.unpack_from(buffer, offset)
+        offset += _LATENCY.size
+        verdicts.append(Verdict(validator, action, Rule[rule] if rule in Rule.__members__ else Rule.NONE, latency))
+
+    return Record(item_id, timestamp, KINDS[kind], Action(outcome), verdicts)
+
+
+def segment_name(timestamp: float) -> str:
+    return datetime.datetime.utcfromtimestamp(timestamp).strftime('%Y-%m-%d') + '.journal'
+
+
+class DecisionJournal:
+    """Writes decision records to daily segment files. Safe to share between threads.
+
+    Parameters
+    ----------
+    path: str
+        Directory the segment files are kept in.
+    """
+    __slots__ = ['path', '_file', '_segment', '_lock']
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._segment = None
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def record(self, record: Record):
+        frame = encode(record)
+        with self._lock:
+            segment = segment_name(record.time)
+            if segment != self._segment:
+                if self._file:
+                    self._file.close()
+                self._file = open(os.path.join(self.path, segment), 'ab')
+                self._segment = segment
+
+            self._file.write(frame)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+                self._segment = None
+
+
+class JournalReader:
+    """Reads records back from the segment files written by :class:`DecisionJournal`.
+
+    Parameters
+    ----------
+    path: str
+        Directory the segment files are kept in.
+    """
+    __slots__ = ['path']
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def segments(self, since: Optional[float] = None) -> List[str]:
+        names = sorted(name for name in os.listdir(self.path) if name.endswith('.journal'))
+        if since is not None:
+            first = segment_name(since)
+            names = [name for name in names if name >= first]
+        return [os.path.join(self.path, name) for name in names]
+
+    @staticmethod
+    def read_segment(path: str, item_id: Optional[str] = None) -> Iterator[Record]:
+        """Iterate over the records of a segment file, oldest first.
+
+        If ``item_id`` is given, only records for that item are returned. Other frames are skipped by comparing the
+        encoded id right after the header, without decoding their verdicts.
+        """
+        if os.path.getsize(path) == 0:
+            return
+
+        key = _pack_str(item_id) if item_id is not None else None
+
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            offset, end = 0, len(buffer)
+            while offset + _LENGTH.size <= end:
+                size, = _LENGTH.unpack_from(buffer, offset)
+                if offset + _LENGTH.size + size > end:
+                    break  # Partially written frame, the bot stopped mid-write
+                start = offset + _LENGTH.size + _HEADER.size
+                if key is None or buffer[start:start + len(key)] == key:
+                    yield decode(buffer, offset + _LENGTH.size)
+                offset += _LENGTH.size + size
+
+    def records(self, since: Optional[float] = None) -> Iterator[Record]:
+        """Iterate over every record, oldest first, optionally only those made after ``since``."""
+        for segment in self.segments(since):
+            for record in self.read_segment(segment):
+                if since is None or record.time >= since:
+                    yield record
+
+    def find(self, item_id: str, since: Optional[float] = None) -> List[Record]:
+        """Find every record for an item, oldest first."""
+        return [
+            record for segment in self.segments(since) for record in self.read_segment(segment, item_id)
+            if since is None or record.time >= since
+        ]
+
+
+def _why(reader: JournalReader, args):
+    records = reader.find(args.id.split('_')[-1])
+    if not records:
+        print(f'No decisions recorded for {args.id}.')
+        return
+
+    for record in records:
+        print(f'{datetime.datetime.utcfromtimestamp(record.time):%Y-%m-%d %H:%M:%S} UTC {record.kind} {record.id}: '
+              f'{record.outcome.name}')
+        for verdict in record.verdicts:
+            rule = f' ({verdict.rule.name})' if verdict.rule != Rule.NONE else ''
+            print(f'    {verdict.validator:<24} {verdict.action.name:<8}{rule:<14} {verdict.latency * 1000:8.1f} ms')
+
+
+def _rates(reader: JournalReader, args):
+    checked, removed, latency = Counter(), Counter(), Counter()
+    total, total_removed = 0, 0
+    for record in reader.records(since=time.time() - args.hours * 3600):
+        total += 1
+        total_removed += record.outcome == Action.REMOVE
+        for verdict in record.verdicts:
+            checked[verdict.validator] += 1
+            removed[verdict.validator] += verdict.action == Action.REMOVE
+            latency[verdict.validator] += verdict.latency
+
+    print(f'{total} items checked in the last {args.hours:g} hours, {total_removed} removed.')
+    for validator, count in checked.most_common():
+        print(f'    {validator:<24} {removed[validator]:>6} / {count:<6} removed ({removed[validator] / count:6.2%})'
+              f'  avg {latency[validator] / count * 1000:8.1f} ms')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m reddit.journal', description='Query the decision journal.')
+    parser.add_argument('--path', default='data/journal', help='Directory containing the journal segments.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    why = commands.add_parser('why', help='Show every decision made about a submission or comment.')
+    why.add_argument('id', help='Item id or fullname (e.g. abc123 or t3_abc123).')
+    why.set_defaults(func=_why)
+
+    rates = commands.add_parser('rates', help='Show removal rates and latency per validator.')
+    rates.add_argument('--hours', type=float, default=24.0, help='How far back to look.')
+    rates.set_defaults(func=_rates)
+
+    args = parser.parse_args(argv)
+    args.func(JournalReader(args.path), args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import re
+from collections import deque
+from typing import Hashable, List
+
+
+class PatternSet:
+    """Matches a large number of literal phrases and regular expressions against text.
+
+    Phrases are compiled into a single Aho-Corasick automaton, so every phrase is found in one pass over the text
+    regardless of how many there are. Regular expressions are joined into one alternation per tag, so the text is
+    searched once per tag rather than once per pattern. Every phrase and pattern carries a tag, and :meth:`search`
+    returns the tags that matched. Since each tag is searched on its own, matches of different tags may overlap.
+
+    Phrases are matched case-insensitively and, by default, only as whole words (``ass`` does not match ``class``).
+    Patterns are compiled with :data:`re.IGNORECASE` and must not use numbered backreferences, since patterns of the
+    same tag share one expression.
+
+    Parameters
+    ----------
+    whole_words: bool
+        Only report phrases that are not surrounded by letters or digits.
+    """
+    __slots__ = ['whole_words', '_goto', '_fail', '_out', '_patterns', '_regexes', '_built']
+
+    def __init__(self, whole_words: bool = True):
+        self.whole_words = whole_words
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._patterns = []
+        self._regexes = []
+        self._built = True
+
+    def add_phrase(self, phrase: str, tag: Hashable):
+        phrase = phrase.strip().lower()
+        if not phrase:
+            return
+
+        state = 0
+        for char in phrase:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+
+        self._out[state].append((len(phrase), tag))
+        self._built = False
+
+    def add_pattern(self, pattern: str, tag: Hashable):
+        re.compile(pattern)  # Raise for invalid patterns now rather than when the set is built
+        self._patterns.append((pattern, tag))
+        self._built = False
+
+    def build(self):
+        """Compute the automaton's failure links and compile the patterns. Called automatically when needed."""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + [out for out in self._out[self._fail[child]]
+                                                       if out not in self._out[child]]
+
+        patterns = {}
+        for pattern, tag in self._patterns:
+            patterns.setdefault(tag, []).append(f'(?:{pattern})')
+        self._regexes = [(tag, re.compile('|'.join(group), re.IGNORECASE)) for tag, group in patterns.items()]
+
+        self._built = True
+
+    def _boundary(self, text: str, start: int, end: int) -> bool:
+        if not self.whole_words:
+            return True
+        return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+    def search(self, text: str) -> List[Hashable]:
+        """Find every tag with at least one phrase or pattern in the text.
+
+        Parameters
+        ----------
+        text: str
+            The text to search.
+
+        Returns
+        -------
+        List[Hashable]
+            The matched tags, in the order they were first found.
+        """
+        if not self._built:
+            self.build()
+
+        found = {}
+        lowered = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for length, tag in out[state]:
+                if tag not in found and self._boundary(lowered, index + 1 - length, index + 1):
+                    found[tag] = None
+
+        for tag, regex in self._regexes:
+            if tag not in found and regex.search(text):
+                found[tag] = None
+
+        return list(found)
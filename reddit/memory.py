@@ -0,0 +1,168 @@
+"""Memory accounting for the long running bot.
+
+:class:`MemoryMonitor` periodically (and whenever the process receives ``SIGUSR2``) appends a report to a JSON lines
+file: the size of every :class:`~reddit.cache.BoundedCache`, the process peak RSS and, when tracemalloc is enabled,
+the source lines that allocated the most memory and how much that grew since the previous report and since start.
+
+The reports can be read back while the bot is running::
+
+    python -m reddit.memory                # per-store sizes and top allocators over time
+    python -m reddit.memory --last 48      # only the last 48 reports
+"""
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+import tracemalloc
+from typing import List, Optional
+
+from .cache import BoundedCache
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class MemoryMonitor:
+    """Collects memory reports for the running bot.
+
+    Parameters
+    ----------
+    config: configparser.ConfigParser
+        The bot configuration. Settings are read from the optional ``[memory]`` section.
+    logger: logging.Logger
+        Logger used to summarize every report.
+    """
+    __slots__ = ['log', 'path', 'interval', 'top', 'frames', 'tracing', '_baseline', '_previous', '_lock']
+
+    FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    )
+
+    def __init__(self, config, logger):
+        self.log = logger
+        self.path = config.get('memory', 'path', fallback='data/memory.jsonl')
+        self.interval = config.getint('memory', 'interval', fallback=3600)
+        self.top = config.getint('memory', 'top', fallback=10)
+        self.frames = config.getint('memory', 'frames', fallback=1)
+        self.tracing = config.getboolean('memory', 'tracemalloc', fallback=False)
+        self._baseline = None
+        self._previous = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start tracing allocations, if enabled. Allocations made before this are not attributed."""
+        if self.tracing and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._baseline = self._snapshot()
+
+    def install(self):
+        """Write a report whenever the process receives SIGUSR2. Must be called from the main thread."""
+        if hasattr(signal, 'SIGUSR2'):
+            signal.signal(signal.SIGUSR2, lambda signum, frame: threading.Thread(
+                target=self.report, name='memory', daemon=True
+            ).start())
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+
+    def _allocators(self) -> List[dict]:
+        snapshot = self._snapshot()
+        previous = {stat.traceback: stat.size for stat in self._previous.statistics('lineno')} if self._previous else {}
+        baseline = {stat.traceback: stat.size for stat in self._baseline.statistics('lineno')} if self._baseline else {}
+        self._previous = snapshot
+
+        allocators = []
+        for stat in snapshot.statistics('lineno')[:self.top]:
+            frame = stat.traceback[0]
+            allocators.append({
+                'location': f'{frame.filename}:{frame.lineno}', 'size': stat.size, 'count': stat.count,
+                'since_previous': stat.size - previous.get(stat.traceback, 0),
+                'since_start': stat.size - baseline.get(stat.traceback, 0),
+            })
+        return allocators
+
+    def report(self, **extra) -> dict:
+        """Write a report to the configured file and log a summary of it.
+
+        Parameters
+        ----------
+        extra:
+            Additional JSON serializable sizes to include, i.e the work queue statistics.
+        """
+        with self._lock:
+            report = {
+                'time': time.time(),
+                'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 if resource else None,
+                'stores': {cache.name: cache.stats() for cache in BoundedCache.instances()},
+            }
+            report.update(extra)
+            if tracemalloc.is_tracing():
+                report['traced'], report['traced_peak'] = tracemalloc.get_traced_memory()
+                report['allocators'] = self._allocators()
+
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(report) + '\n')
+
+        stores = ' '.join(f'{name}={stats["items"]}' for name, stats in report['stores'].items())
+        self.log.info(f'[Memory] max_rss={_mb(report["max_rss"])} traced={_mb(report.get("traced"))} {stores}')
+        for allocator in report.get('allocators', ()):
+            self.log.debug(f'[Memory] {allocator["location"]}: {_mb(allocator["size"])} '
+                           f'({allocator["since_previous"] / 1024:+.1f} KiB since previous report)')
+        return report
+
+
+def _mb(size: Optional[int]) -> str:
+    return f'{size / 1024 / 1024:.1f}MiB' if size is not None else '-'
+
+
+def read_reports(path: str) -> List[dict]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m reddit.memory', description='Show the memory reports over time.')
+    parser.add_argument('--path', default='data/memory.jsonl', help='File the reports are written to.')
+    parser.add_argument('--last', type=int, default=24, help='Number of most recent reports to show.')
+    args = parser.parse_args(argv)
+
+    reports = read_reports(args.path)[-args.last:]
+    if not reports:
+        print(f'No memory reports in {args.path}.')
+        return
+
+    stores = sorted({name for report in reports for name in report['stores']})
+    print(f'{"time":<20} {"max_rss":>10} {"traced":>10}  ' + ' '.join(f'{name:>16}' for name in stores))
+    for report in reports:
+        sizes = ' '.join(f'{report["stores"].get(name, {}).get("items", "-"):>16}' for name in stores)
+        when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(report['time']))
+        print(f'{when:<20} {_mb(report["max_rss"]):>10} {_mb(report.get("traced")):>10}  {sizes}')
+
+    latest = reports[-1].get('allocators')
+    if not latest:
+        print('\nStart the bot with tracemalloc enabled in [memory] to see the top allocators.')
+        return
+
+    print('\nTop allocators in the latest report, and their size in each report shown above:')
+    for allocator in latest:
+        history = [
+            next((a['size'] for a in report.get('allocators', ()) if a['location'] == allocator['location']), None)
+            for report in reports
+        ]
+        print(f'    {allocator["location"]}')
+        print(f'        {" ".join(_mb(size) for size in history)} ({allocator["since_start"] / 1024:+.1f} KiB since start)')
+
+
+if __name__ == '__main__':
+    main()
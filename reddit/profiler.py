@@ -0,0 +1,137 @@
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+
+class SamplingProfiler:
+    """On-demand sampling profiler for the running bot.
+
+    Nothing runs until a profile is requested, either by calling :meth:`start` or by sending the process
+    ``SIGUSR1`` (``kill -USR1 <pid>``). While active, a background thread samples the stack of every other thread
+    (streams, scheduler jobs and validators alike) and, once the duration has passed, writes:
+
+    * ``profile-<time>.folded`` - collapsed stacks, one ``frame;frame;frame count`` line per unique stack, ready for
+      ``flamegraph.pl`` or speedscope.
+    * ``profile-<time>.txt`` - samples per thread and per validator.
+
+    Parameters
+    ----------
+    config: configparser.ConfigParser
+        The bot configuration. Settings are read from the optional ``[profiling]`` section.
+    logger: logging.Logger
+        Logger used to report when profiling starts and where the output was written.
+    """
+    __slots__ = ['log', 'path', 'duration', 'interval', '_thread', '_lock']
+
+    def __init__(self, config, logger):
+        self.log = logger
+        self.path = config.get('profiling', 'path', fallback='data/profiles')
+        self.duration = config.getfloat('profiling', 'duration', fallback=30.0)
+        self.interval = config.getfloat('profiling', 'interval', fallback=0.01)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def install(self):
+        """Start a profile whenever the process receives SIGUSR1. Must be called from the main thread."""
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.start())
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: Optional[float] = None) -> bool:
+        """Begin profiling for ``duration`` seconds. Returns False if a profile is already running."""
+        with self._lock:
+            if self.running:
+                return False
+
+            self._thread = threading.Thread(
+                target=self._run, args=(duration or self.duration,), name='profiler', daemon=True
+            )
+            self._thread.start()
+            return True
+
+    @staticmethod
+    def _owner(frame) -> Optional[str]:
+        """Get the name of the class a frame's function belongs to, if it is a method."""
+        code = frame.f_code
+        if hasattr(code, 'co_qualname'):  # Python 3.11+
+            return code.co_qualname.rpartition('.')[0] or None
+        if code.co_argcount and code.co_varnames[0] in ('self', 'cls'):
+            owner = frame.f_locals.get(code.co_varnames[0])
+            return (owner if isinstance(owner, type) else type(owner)).__name__
+        return None
+
+    @classmethod
+    def _label(cls, frame) -> str:
+        code = frame.f_code
+        name = getattr(code, 'co_qualname', None)
+        if name is None:
+            owner = cls._owner(frame)
+            name = f'{owner}.{code.co_name}' if owner else code.co_name
+        return f'{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+    @classmethod
+    def _validator(cls, frame) -> Optional[str]:
+        if os.sep + 'validators' + os.sep not in frame.f_code.co_filename:
+            return None
+        owner = cls._owner(frame)
+        return owner.split('.')[0] if owner else None
+
+    def _run(self, duration: float):
+        self.log.info(f'[Profiler] Profiling for {duration:g} seconds...')
+
+        stacks, threads, validators = Counter(), Counter(), Counter()
+        names = {}
+        own = threading.get_ident()
+        samples = 0
+        end = time.monotonic() + duration
+        while time.monotonic() < end:
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+
+                stack, validator = [], None
+                while frame is not None:
+                    stack.append(self._label(frame))
+                    validator = self._validator(frame) or validator  # Outermost validator frame wins
+                    frame = frame.f_back
+
+                name = names.get(ident, str(ident))
+                stack.append(name)
+                stacks[';'.join(reversed(stack))] += 1
+                threads[name] += 1
+                if validator:
+                    validators[validator] += 1
+
+            samples += 1
+            time.sleep(self.interval)
+
+        self._write(stacks, threads, validators, samples, duration)
+
+    def _write(self, stacks: Counter, threads: Counter, validators: Counter, samples: int, duration: float):
+        os.makedirs(self.path, exist_ok=True)
+        base = os.path.join(self.path, time.strftime('profile-%Y%m%d-%H%M%S'))
+
+        with open(base + '.folded', 'w', encoding='utf-8') as f:
+            for stack, count in stacks.items():
+                f.write(f'{stack} {count}\n')
+
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(f'{samples} samples over {duration:g} seconds ({self.interval * 1000:g} ms interval)\n\n')
+            f.write('Samples per thread:\n')
+            for name, count in threads.most_common():
+                f.write(f'    {name:<32} {count:>8} ({count / max(samples, 1):6.1%} of time)\n')
+            f.write('\nSamples per validator:\n')
+            for name, count in validators.most_common():
+                f.write(f'    {name:<32} {count:>8} ({count / max(samples, 1):6.1%} of time)\n')
+
+        self.log.info(f'[Profiler] Profile written to {base}.folded and {base}.txt')
@@ -1,14 +1,24 @@
 import configparser
 import importlib
+import json
 import sys
 import time
 from logging.handlers import RotatingFileHandler
+from typing import List, Optional
 
 import praw
-import praw.models as models
 from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from .budget import Priority, RateBudget
+from .cache import BoundedCache
+from .client import HttpClient
+from .guard import ValidatorGuard
+from .journal import DecisionJournal, Record, Verdict
+from .memory import MemoryMonitor
+from .profiler import SamplingProfiler
+from .snapshot import CommentSnapshot, SubmissionSnapshot, snapshot
+from .work import Deferred, Source, WorkQueue
 from .scheduler import *
 from .validator import *
 
@@ -29,10 +39,22 @@ class Reddit:
         Logger used for saving log files and debugging.
     reddit: praw.Reddit
         The PRAW instance used for interaction with Reddit.
+    budget: RateBudget
+        Shares the Reddit rate limit between streams, moderation actions and background jobs.
     subreddits: praw.Subreddit
         Subreddit instance of watched subreddits
     scheduler: SmartScheduler
         Custom scheduler with misfire protection used for background tasks.
+    http: HttpClient
+        Shared client validators use for requests to external APIs.
+    journal: Optional[DecisionJournal]
+        Binary journal every decision is recorded to, if enabled.
+    profiler: SamplingProfiler
+        Idle until SIGUSR1 is received, then profiles every thread for a configured duration.
+    queue: WorkQueue
+        Bounded priority queue of items waiting for validation.
+    guard: ValidatorGuard
+        Runs every validator under a time budget, with a fallback verdict on faults.
     domains: dict
         Known domains the validators may look out for.
     validators: dict
@@ -45,8 +67,9 @@ class Reddit:
 
     __slots__ = [
         'config', '_post_checks', '_comment_checks', '_report_checks',
-        'domains', 'reddit', 'scheduler', 'validators', 'extensions', 'log', 'start_time',
-        '_comment_thread', '_submission_thread', 'subreddits', '_results'
+        'domains', 'reddit', 'budget', 'scheduler', 'http', 'journal', 'profiler', 'memory', 'queue', 'guard',
+        'validators', 'extensions', 'log', 'start_time',
+        '_comment_thread', '_submission_thread', '_worker_threads', '_reported', 'subreddits', '_results'
     ]
 
     def __init__(self, config_path: str = None):
@@ -62,6 +85,7 @@ class Reddit:
             username=info['username'], password=info['password'], client_id=info['client_id'],
             client_secret=info['client_secret'], user_agent=info['user_agent']
         )
+        self.budget = RateBudget(self.reddit, self.config, self.log)
         self.subreddits = self.reddit.subreddit(self.config.get('general', 'subreddits'))
 
         self.log.info(f'[Core] Logged in as {self.reddit.user.me()}')
@@ -70,18 +94,35 @@ class Reddit:
             executors=dict(default=ThreadPoolExecutor(20), processpool=ProcessPoolExecutor()),
             job_defaults=dict(coalesce=True, max_instances=4))
         )
+        self.http = HttpClient(self.config, self.log)
+        self.journal = None
+        if self.config.getboolean('journal', 'enabled', fallback=True):
+            self.journal = DecisionJournal(self.config.get('journal', 'path', fallback='data/journal'))
 
         self.domains = dict(config_path.items('domains'))
         self.validators = {}
         self.extensions = {'COMMENT': [], 'SUBMISSION': []}
 
+        self.profiler = SamplingProfiler(self.config, self.log)
+        self.memory = MemoryMonitor(self.config, self.log)
+        self.queue = WorkQueue(
+            self.config.getint('queue', 'size', fallback=1000),
+            self.config.getfloat('queue', 'overload_age', fallback=60.0),
+            self.config.getint('queue', 'catch_up_size', fallback=1000)
+        )
+        self.guard = ValidatorGuard(self.config, self.log)
         self.start_time = time.time()
 
         if path:
             self.log.debug(f'[Core] Loaded custom configuration file from {path}')
 
-        self._comment_thread = threading.Thread(target=self.process_comments, args=())
-        self._submission_thread = threading.Thread(target=self.process_submissions, args=())
+        self._comment_thread = threading.Thread(target=self.process_comments, args=(), name='comments')
+        self._submission_thread = threading.Thread(target=self.process_submissions, args=(), name='submissions')
+        self._worker_threads = [
+            threading.Thread(target=self.process_queue, args=(), name=f'worker-{i}')
+            for i in range(self.config.getint('queue', 'workers', fallback=1))
+        ]
+        self._reported = BoundedCache('core.reported', max_items=1000)
         self._post_checks = []
         self._comment_checks = []
         self._report_checks = []
@@ -91,7 +132,18 @@ class Reddit:
         """Begin execution of all processing."""
         self._setup()
 
+        self.profiler.install()
+        self.memory.start()
+        self.memory.install()
+        if self.memory.interval > 0:
+            self.scheduler.register_job('memory', self.memory.interval, self.report_memory, self.log)
+        self.scheduler.register_job('reports', self.config.getint('queue', 'report_interval', fallback=60),
+                                    self.process_reports, self.log)
+        self.scheduler.register_job('queue_stats', self.config.getint('queue', 'stats_interval', fallback=60),
+                                    self.export_queue_stats, self.log)
         self.scheduler.start()
+        for worker in self._worker_threads:
+            worker.start()
         self._comment_thread.start()
         self._submission_thread.start()
 
@@ -160,110 +212,279 @@ class Reddit:
 
         del extension
 
+    def _forever(self, name: str, target):
+        """Run a processing loop, restarting it whenever it raises so one bad item or outage cannot stop the bot."""
+        delay = self.config.getfloat('deadlines', 'restart_delay', fallback=30.0)
+        while True:
+            try:
+                target()
+            except Exception as error:
+                self.log.error(f'[Core] {name} stopped with an exception, restarting in {delay:g} seconds.',
+                               exc_info=error)
+                time.sleep(delay)
+
     def process_submissions(self):
         self.log.info(f'[Core] Beginning submission processing!')
-        self.log.info(f'[Core] Processing moderator queue...')
+        self.log.info(f'[Core] Queueing moderator queue...')
 
-        for submission in self.subreddits.mod.modqueue(only='submissions'):
-            self.check_submission(submission)
+        try:
+            for submission in self.subreddits.mod.modqueue(only='submissions'):
+                self.queue.put('submission', SubmissionSnapshot.from_praw(submission), Source.MODQUEUE)
 
-        self.log.info(f'[Core] Finished moderator queue processing!')
-        self.log.info(f'[Core] Processing unmoderated queue...')
+            self.log.info(f'[Core] Finished queueing moderator queue!')
+            self.log.info(f'[Core] Queueing unmoderated queue...')
 
-        for submission in self.subreddits.mod.unmoderated():
-            self.check_submission(submission)
+            for submission in self.subreddits.mod.unmoderated():
+                self.queue.put('submission', SubmissionSnapshot.from_praw(submission), Source.STREAM)
+
+            self.log.info(f'[Core] Finished queueing unmoderated queue!')
+        except Exception as error:
+            self.log.error(f'[Core] Unable to queue the moderator queues!', exc_info=error)
 
-        self.log.info(f'[Core] Finished unmoderated queue processing!')
         self.log.info(f'[Core] Processing submission stream...')
+        self._forever('Submission stream', self._stream_submissions)
 
+    def _stream_submissions(self):
         for submission in self.subreddits.stream.submissions():
             if submission.created_utc - self.start_time < 0:  # Ignore old (they get loaded initially sometimes)
                 continue
             elif submission.removed:  # In case another bot got to it first!
                 continue
             else:
-                self.check_submission(submission)
-
-    def check_submission(self, submission: models.Submission):
-        approved, manual = False, False
-        for validator in self.extensions['SUBMISSION']:
-            validator.dlog('Checking submission...')
-            action, rule = validator.validate(submission)
-            if action == Action.REMOVE:
-                validator.dlog('Submission failed check!')
-                self.remove_submission(submission, rule)
-                break
-            elif action == Action.MANUAL:
-                validator.dlog('Leaving for manual approval.')
-                manual = True
-            elif action == Action.PASS:
-                validator.dlog('Ignoring submission.')
-            else:
-                approved = True
-                validator.dlog('Submission passed check!')
-        else:
-            if approved and not manual:  # In case no validators explicitly approve, they might all pass!
-                self.approve_submission(submission)
-            elif manual:
-                self.log.debug(f'[Core] Submission waiting for manual approval! {submission.permalink}')
-
-    def approve_submission(self, submission: models.Submission):
-        self.log.debug(f'[Core] Submission would have been approved! {submission.permalink}')
-        submission.mod.approve()
-
-    def remove_submission(self, submission: models.Submission, rule: Rule):
-        self.log.debug(f'[Core] Submission would have been removed! {submission.permalink}')
-        submission.reply(str(rule)).mod.distinguish(sticky=False)
-        submission.mod.remove()
+                self.queue.put('submission', SubmissionSnapshot.from_praw(submission), Source.STREAM)
 
     def process_comments(self):
         self.log.info(f'[Core] Beginning comment processing!')
+        self._forever('Comment stream', self._stream_comments)
+
+    def _stream_comments(self):
         for comment in self.subreddits.stream.comments():
             if comment.created_utc - self.start_time < 0:
                 continue
             else:
-                self.check_comment(comment)
+                self.queue.put('comment', CommentSnapshot.from_praw(comment), Source.STREAM)
+
+    def process_reports(self):
+        """Queue newly reported items ahead of the streams. Runs on the scheduler."""
+        self.budget.wait(Priority.METADATA)
+        for item in self.subreddits.mod.reports(limit=100):
+            if item.fullname in self._reported:
+                continue
+
+            self._reported[item.fullname] = None
+            item = snapshot(item)
+            self.queue.put(item.kind, item, Source.REPORTS)
+
+    def process_queue(self):
+        """Validate queued items, and deferred items whenever the queue runs empty."""
+        self._forever('Queue worker', self._work)
+
+    def _work(self):
+        while True:
+            work = self.queue.get(timeout=1.0)
+            if work is not None:
+                try:
+                    if work.kind == 'submission':
+                        self.check_submission(work.item, cheap_only=self.queue.overloaded)
+                    else:
+                        self.check_comment(work.item, cheap_only=self.queue.overloaded)
+                except Exception as error:
+                    self._failed(work.kind, work.item, error)
+                continue
 
-    def check_comment(self, comment: models.Comment):
-        if comment.submission.archived:
+            deferred = self.queue.catch_up()
+            if deferred is not None:
+                self.log.debug(f'[Core] Catching up on deferred {deferred.kind} {deferred.item.id}.')
+                try:
+                    self.check(deferred.kind, deferred.item, resume=deferred)
+                except Exception as error:
+                    self._failed(deferred.kind, deferred.item, error)
+
+    def _failed(self, kind: str, item, error: Exception):
+        """Log and record an item whose check raised, leaving it for manual review, so the worker can move on."""
+        self.log.error(f'[Core] Unable to check {kind} {item.id}, leaving it for manual review.', exc_info=error)
+        self.record(kind, item, Action.MANUAL, [])
+
+    def export_queue_stats(self):
+        """Log the queue statistics and write them to the configured stats file. Runs on the scheduler."""
+        stats = self.queue.stats()
+        self.log.info(
+            f'[Queue] depth={stats["depth"]} oldest={stats["oldest"]:.1f}s age={stats["age"]:.1f}s '
+            f'overloaded={stats["overloaded"]} catch_up={stats["catch_up"]} deferred={stats["deferred"]} '
+            f'dropped={stats["dropped"]}'
+        )
+
+        path = self.config.get('queue', 'stats_path', fallback='')
+        if path:
+            with open(path, 'w') as f:
+                json.dump(dict(
+                    stats, time=time.time(), validators=self.guard.stats(), budget=self.budget.stats()
+                ), f)
+
+        budget = ' '.join(f'{name}={count["granted"]}/{count["held"]}' for name, count in self.budget.stats().items())
+        self.log.info(f'[Budget] granted/held {budget}')
+
+        for name, faults in self.guard.stats().items():
+            if faults['timeouts'] or faults['errors'] or faults['busy']:
+                self.log.info(f'[Guard] {name}: timeouts={faults["timeouts"]} errors={faults["errors"]} '
+                              f'quarantined={faults["quarantined"]} stuck={faults["stuck"]} busy={faults["busy"]} '
+                              f'state={faults["state"]}')
+
+    def report_memory(self):
+        """Write a memory report including the work queue. Runs on the scheduler."""
+        stats = self.queue.stats()
+        self.memory.report(queue={'depth': stats['depth'], 'catch_up': stats['catch_up']})
+
+    def check_submission(self, submission: SubmissionSnapshot, cheap_only: bool = False):
+        self.check('submission', submission, cheap_only)
+
+    def check_comment(self, comment: CommentSnapshot, cheap_only: bool = False):
+        if comment.archived:
             return  # We don't want to revalidate comments or go too old
 
-        approved, manual = False, True
-        for validator in self.extensions['COMMENT']:
-            validator.dlog('Checking comment...')
-            action, rule = validator.validate(comment)
+        self.check('comment', comment, cheap_only)
+
+    def check(self, kind: str, item, cheap_only: bool = False, resume: Optional[Deferred] = None):
+        """Run an item through the validators and act on the verdict.
+
+        Parameters
+        ----------
+        kind: str
+            Either 'submission' or 'comment'.
+        item: Snapshot
+            The item to validate.
+        cheap_only: bool
+            Only run validators marked as cheap. If any others are skipped and the item is not removed, it is
+            deferred to be finished by the catch-up pass.
+        resume: Optional[Deferred]
+            A deferred item to finish validating, continuing from the verdicts it already has.
+        """
+        if resume:
+            approved, manual, verdicts, validators = resume.approved, resume.manual, resume.verdicts, resume.validators
+        else:
+            # Comments are never approved automatically, only left for manual approval
+            approved, manual, verdicts, validators = False, kind == 'comment', [], self.extensions[kind.upper()]
+
+        outcome, skipped = Action.PASS, []
+        for validator in validators:
+            if cheap_only and not validator.cheap:
+                skipped.append(validator)
+                continue
+
+            validator.dlog(f'Checking {kind}...')
+            start = time.perf_counter()
+            action, rule = self.guard.validate(validator, item)
+            verdicts.append(Verdict(type(validator).__name__, action, rule, time.perf_counter() - start))
             if action == Action.REMOVE:
-                validator.dlog('Comment failed check!')
-                self.remove_comment(comment, rule)
+                validator.dlog(f'{kind.capitalize()} failed check!')
+                outcome = self.act(kind, item, Action.REMOVE, rule)
                 break
             elif action == Action.MANUAL:
                 validator.dlog('Leaving for manual approval.')
                 manual = True
             elif action == Action.PASS:
-                validator.dlog('Ignoring comment.')
+                validator.dlog(f'Ignoring {kind}.')
             else:
                 approved = True
-                validator.dlog('Comment passed check!')
+                validator.dlog(f'{kind.capitalize()} passed check!')
         else:
-            if approved and not manual:  # In case no validators explicitly approve, they might all pass!
-                self.approve_comment(comment)
+            if skipped:
+                self.queue.defer(Deferred(kind, item, approved, manual, verdicts, skipped))
+                return  # Recorded once the catch-up pass has run the skipped validators
+            elif approved and not manual:  # In case no validators explicitly approve, they might all pass!
+                outcome = self.act(kind, item, Action.APPROVE)
+            elif any(verdict.action == Action.MANUAL for verdict in verdicts):
+                self.log.debug(f'[Core] {kind.capitalize()} waiting for manual approval! {item.permalink}')
+                outcome = Action.MANUAL
+
+        self.decided(kind, item, outcome)
+        self.record(kind, item, outcome, verdicts)
+
+    def decided(self, kind: str, item, outcome: Action):
+        """Tell every validator of an item's kind what the bot finally did with it."""
+        for validator in self.extensions[kind.upper()]:
+            try:
+                validator.decided(item, outcome)
+            except Exception as error:
+                self.log.error(f'[Core] {type(validator).__name__} failed to handle the outcome of {kind} {item.id}!',
+                               exc_info=error)
+
+    def act(self, kind: str, item, action: Action, rule: Rule = Rule.NONE) -> Action:
+        """Remove or approve an item.
+
+        Returns
+        -------
+        Action
+            The action taken, or MANUAL if it failed (i.e the item was deleted or Reddit returned an error).
+        """
+        try:
+            if action == Action.REMOVE:
+                (self.remove_submission if kind == 'submission' else self.remove_comment)(item, rule)
+            else:
+                (self.approve_submission if kind == 'submission' else self.approve_comment)(item)
+        except Exception as error:
+            self.log.error(f'[Core] Unable to {action.name.lower()} {kind} {item.id}, leaving it for manual review.',
+                           exc_info=error)
+            return Action.MANUAL
+        return action
+
+    def approve_submission(self, submission: SubmissionSnapshot):
+        self.log.debug(f'[Core] Submission would have been approved! {submission.permalink}')
+        self.budget.wait(Priority.REMOVAL)
+        submission.live().mod.approve()
 
-    def approve_comment(self, comment: Comment):
+    def remove_submission(self, submission: SubmissionSnapshot, rule: Rule):
+        self.log.debug(f'[Core] Submission would have been removed! {submission.permalink}')
+        self.budget.wait(Priority.REMOVAL)
+        submission = submission.live()
+        submission.reply(str(rule)).mod.distinguish(sticky=False)
+        submission.mod.remove()
+
+    def approve_comment(self, comment: CommentSnapshot):
         self.log.debug(f'[Core] Comment would have been approved!')
-        comment.mod.approve()
+        self.budget.wait(Priority.REMOVAL)
+        comment.live().mod.approve()
 
-    def remove_comment(self, comment: Comment, rule: Rule):
+    def remove_comment(self, comment: CommentSnapshot, rule: Rule):
         self.log.debug(f'[Core] Comment would have been removed!')
+        self.budget.wait(Priority.REMOVAL)
+        comment = comment.live()
         if self.config.getboolean('general', 'comment_reason'):
             comment.reply(str(rule)).mod.distinguish(sticky=False)
         comment.mod.remove()
 
+    def record(self, kind: str, item, outcome: Action, verdicts: List[Verdict]):
+        """Record a decision to the journal, if enabled.
+
+        Parameters
+        ----------
+        kind: str
+            Either 'submission' or 'comment'.
+        item: Snapshot
+            The item the decision was made about.
+        outcome: Action
+            The action the bot took on the item.
+        verdicts: List[Verdict]
+            The verdict of every validator that was run, in order.
+        """
+        if self.journal is None:
+            return
+
+        try:
+            self.journal.record(Record(item.id, time.time(), kind, outcome, verdicts))
+        except OSError as error:
+            self.log.error(f'[Core] Unable to write to the decision journal! (Error: {error})')
+
 
 def set_logger(level: str):
     level = level.upper()
 
     logger = logging.getLogger('reddit')
     logger.setLevel(level)
+    for handler in list(logger.handlers):  # Calling this again must replace the handlers, not add more
+        logger.removeHandler(handler)
+        handler.close()
+
     log_format = logging.Formatter('%(asctime)s:%(levelname)s:%(name)s: %(message)s')
 
     ch = logging.StreamHandler(sys.stdout)
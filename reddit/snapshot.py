@@ -0,0 +1,118 @@
+from typing import Optional, Union
+
+import praw
+from praw.models import Comment, Submission
+
+
+class Snapshot:
+    """Immutable record of the fields validators read from a submission or comment.
+
+    Snapshots are built once per item from the data Reddit already sent in the listing, so reading a field never
+    triggers a request the way attribute access on a lazy PRAW object can. They also keep only the fields below,
+    rather than the whole listing JSON. Use :meth:`live` to get a PRAW object for moderation actions.
+    """
+    __slots__ = ['id', 'fullname', 'author', 'created_utc', 'permalink', '_reddit']
+
+    kind = None
+    COMMON = ('id', 'fullname', 'author', 'created_utc', 'permalink')
+    FIELDS = ()
+
+    def __init__(self, reddit: Optional[praw.Reddit] = None, **fields):
+        object.__setattr__(self, '_reddit', reddit)
+        for name in self.COMMON + self.FIELDS:
+            object.__setattr__(self, name, fields.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __eq__(self, other):
+        return isinstance(other, Snapshot) and other.fullname == self.fullname
+
+    def __hash__(self):
+        return hash(self.fullname)
+
+    def __repr__(self):
+        return f'{type(self).__name__}(id={self.id!r})'
+
+    @staticmethod
+    def _common(data: dict) -> dict:
+        author = data.get('author')
+        return dict(
+            id=data.get('id'),
+            fullname=data.get('name'),
+            author=str(author) if author is not None else None,  # Redditor.__str__ is the name, no request is made
+            created_utc=data.get('created_utc', 0.0),
+            permalink=data.get('permalink', ''),
+        )
+
+    @classmethod
+    def from_praw(cls, item: Union[Submission, Comment]) -> 'Snapshot':
+        """Build a snapshot from the attributes a PRAW object already holds, without fetching it."""
+        return cls.from_data(vars(item), getattr(item, '_reddit', None))
+
+    @classmethod
+    def from_data(cls, data: dict, reddit: Optional[praw.Reddit] = None) -> 'Snapshot':
+        """Build a snapshot from listing JSON (or the attributes of a PRAW object)."""
+        raise NotImplementedError
+
+    def live(self):
+        """Get a lazy PRAW object for this item, for moderation actions or fields not in the snapshot."""
+        raise NotImplementedError
+
+
+class SubmissionSnapshot(Snapshot):
+    __slots__ = [
+        'title', 'selftext', 'url', 'domain', 'is_self', 'link_flair_text', 'link_flair_css_class', 'archived',
+        'removed'
+    ]
+
+    kind = 'submission'
+    FIELDS = tuple(__slots__)
+
+    @classmethod
+    def from_data(cls, data: dict, reddit: Optional[praw.Reddit] = None) -> 'SubmissionSnapshot':
+        return cls(
+            reddit, **cls._common(data),
+            title=data.get('title', ''),
+            selftext=data.get('selftext', ''),
+            url=data.get('url', ''),
+            domain=data.get('domain', ''),
+            is_self=data.get('is_self', False),
+            link_flair_text=data.get('link_flair_text'),
+            link_flair_css_class=data.get('link_flair_css_class'),
+            archived=data.get('archived', False),
+            removed=data.get('removed', False),
+        )
+
+    def live(self) -> Submission:
+        if self._reddit is None:
+            raise ValueError('Snapshot was not built from a Reddit instance')
+        return self._reddit.submission(id=self.id)
+
+
+class CommentSnapshot(Snapshot):
+    __slots__ = ['body', 'submission_id', 'author_flair_css_class', 'archived']
+
+    kind = 'comment'
+    FIELDS = tuple(__slots__)
+
+    @classmethod
+    def from_data(cls, data: dict, reddit: Optional[praw.Reddit] = None) -> 'CommentSnapshot':
+        link_id = data.get('link_id') or ''
+        return cls(
+            reddit, **cls._common(data),
+            body=data.get('body', ''),
+            submission_id=link_id.split('_', 1)[-1],
+            author_flair_css_class=data.get('author_flair_css_class'),
+            archived=data.get('archived', False),
+        )
+
+    def live(self) -> Comment:
+        if self._reddit is None:
+            raise ValueError('Snapshot was not built from a Reddit instance')
+        return self._reddit.comment(id=self.id)
+
+
+def snapshot(item: Union[Submission, Comment]) -> Snapshot:
+    """Build the snapshot matching the type of a PRAW submission or comment."""
+    return (CommentSnapshot if isinstance(item, Comment) else SubmissionSnapshot).from_praw(item)
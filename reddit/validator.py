@@ -5,9 +5,8 @@ import logging
 
 from typing import Tuple
 
-from praw.models import Submission, Comment
-
 from .enums import Action, Rule
+from .snapshot import CommentSnapshot, SubmissionSnapshot
 
 
 class Validator:
@@ -20,9 +19,14 @@ class Validator:
     reddit: praw.Reddit
         The main bot instance. Used to access configuration attributes
     config: configparser.ConfigParser
+    cheap: bool
+        Whether the validator is cheap enough to keep running while the bot is overloaded. Validators that call
+        external APIs or make extra Reddit requests should set this to False so they are deferred instead.
     """
     __slots__ = ['_praw', 'config', 'reddit']
 
+    cheap = True
+
     def __init__(self, reddit):
         super().__init__()
         self._praw = reddit.reddit
@@ -37,6 +41,20 @@ class Validator:
         """Base processing implementation. Gets called on an interval for validator processing."""
         pass
 
+    def decided(self, item, outcome: Action):
+        """Called once the bot has acted on an item this validator checked.
+
+        Use this rather than :meth:`validate` to remember items, since a later validator may still remove the item.
+
+        Parameters
+        ----------
+        item: Union[SubmissionSnapshot, CommentSnapshot]
+            The item that was checked.
+        outcome: Action
+            What the bot did with the item: REMOVE, APPROVE, MANUAL or PASS.
+        """
+        pass
+
     def dlog(self, message: str):
         """Log messages at the debug level. The validator name is prefixed automatically!
 
@@ -53,13 +71,13 @@ class Validator:
 
 class SubmissionValidator(Validator):
     """Base :class:`Validator` used for validators meant to validate a Submission"""
-    def validate(self, submission: Submission) -> Tuple[Action, Rule]:
+    def validate(self, submission: SubmissionSnapshot) -> Tuple[Action, Rule]:
         """Validate a submission and return a verdict.
 
         Parameters
         ---------
-        submission: praw.models.Submission
-            Submission to be validated.
+        submission: SubmissionSnapshot
+            Submission to be validated. Use ``submission.live()`` for anything not in the snapshot.
 
         Returns
         -------
@@ -83,13 +101,13 @@ class SubmissionValidator(Validator):
 
 class CommentValidator(Validator):
     """Base Validator used for validators meant to validate a Submission"""
-    def validate(self, comment: Comment) -> Tuple[Action, Rule]:
-        """Validate a submission and return a verdict.
+    def validate(self, comment: CommentSnapshot) -> Tuple[Action, Rule]:
+        """Validate a comment and return a verdict.
 
         Parameters
         ---------
-        comment: praw.models.Submission
-            Submission to be validated.
+        comment: CommentSnapshot
+            Comment to be validated. Use ``comment.live()`` for anything not in the snapshot.
 
         Returns
         -------
@@ -0,0 +1,116 @@
+import itertools
+import queue
+import threading
+import time
+from enum import IntEnum
+from typing import List, NamedTuple, Optional
+
+from .cache import BoundedCache
+
+
+class Source(IntEnum):
+    """Where an item was ingested from. Lower values are validated first."""
+    MODQUEUE = 0
+    REPORTS = 1
+    STREAM = 2
+
+
+class Work(NamedTuple):
+    kind: str
+    item: object
+    source: Source
+    age: float
+
+
+class Deferred(NamedTuple):
+    """An item whose expensive validators were skipped while overloaded, and the verdicts reached so far."""
+    kind: str
+    item: object
+    approved: bool
+    manual: bool
+    verdicts: list
+    validators: list
+
+
+class WorkQueue:
+    """Bounded priority queue between ingestion and validation.
+
+    Ingest threads block in :meth:`put` while the queue is full, so bursts are absorbed by the queue instead of piling
+    up without limit. Items are handed out by :class:`Source` first, then in arrival order.
+
+    Once an item has waited longer than ``overload_age`` the queue is *overloaded*: the core only runs cheap
+    validators and hands the rest to :meth:`defer`. Deferred items are picked up by :meth:`catch_up` whenever the
+    queue runs empty. Overload ends once items wait less than half of ``overload_age`` again.
+
+    Parameters
+    ----------
+    size: int
+        Maximum number of items waiting for validation.
+    overload_age: float
+        Time (seconds) an item may wait before the queue counts as overloaded.
+    catch_up_size: int
+        Maximum number of deferred items kept. The oldest are dropped (left for manual review) beyond this.
+    """
+    __slots__ = ['overload_age', 'overloaded', 'age', 'processed', 'deferred', 'dropped', '_queue', '_catch_up',
+                 '_counter', '_lock']
+
+    def __init__(self, size: int = 1000, overload_age: float = 60.0, catch_up_size: int = 1000):
+        self.overload_age = overload_age
+        self.overloaded = False
+        self.age = 0.0
+        self.processed = 0
+        self.deferred = 0
+        self.dropped = 0
+        self._queue = queue.PriorityQueue(maxsize=size)
+        self._catch_up = BoundedCache('queue.catch_up', max_items=catch_up_size)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def put(self, kind: str, item, source: Source):
+        """Queue an item for validation, blocking while the queue is full."""
+        self._queue.put((source, next(self._counter), time.time(), kind, item))
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Work]:
+        """Get the next item to validate, or None if nothing arrived within ``timeout`` seconds."""
+        try:
+            source, _, queued, kind, item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+        age = time.time() - queued
+        with self._lock:
+            self.age = age
+            self.processed += 1
+            if age > self.overload_age:
+                self.overloaded = True
+            elif age < self.overload_age / 2:
+                self.overloaded = False
+        return Work(kind, item, source, age)
+
+    def defer(self, deferred: Deferred):
+        with self._lock:
+            if len(self._catch_up) == self._catch_up.max_items:
+                self.dropped += 1
+            self._catch_up[next(self._counter)] = deferred
+            self.deferred += 1
+
+    def catch_up(self) -> Optional[Deferred]:
+        """Get the oldest deferred item, if any. Only call this while the queue is empty."""
+        with self._lock:
+            return self._catch_up.popitem(last=False)[1] if self._catch_up else None
+
+    def stats(self) -> dict:
+        with self._queue.mutex:
+            waiting: List[tuple] = list(self._queue.queue)
+        with self._lock:
+            return {
+                'depth': len(waiting),
+                'oldest': time.time() - min(entry[2] for entry in waiting) if waiting else 0.0,
+                'age': self.age,
+                'overloaded': self.overloaded,
+                'catch_up': len(self._catch_up),
+                'processed': self.processed,
+                'deferred': self.deferred,
+                'dropped': self.dropped,
+                'by_source': {source.name.lower(): sum(entry[0] == source for entry in waiting) for source in Source},
+            }
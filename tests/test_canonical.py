@@ -0,0 +1,53 @@
+import unittest
+
+from reddit.canonical import canonical_url, youtube_id
+
+
+class YoutubeIdTest(unittest.TestCase):
+    def test_video_urls(self):
+        for url in ('https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'https://youtu.be/dQw4w9WgXcQ?t=30',
+                    'https://m.youtube.com/shorts/dQw4w9WgXcQ', 'https://www.youtube.com/embed/dQw4w9WgXcQ',
+                    'https://youtube.com/live/dQw4w9WgXcQ', 'https://youtube.com/v/dQw4w9WgXcQ'):
+            with self.subTest(url=url):
+                self.assertEqual(youtube_id(url), 'dQw4w9WgXcQ')
+
+    def test_not_a_video(self):
+        for url in ('https://www.youtube.com/playlist?list=PLaaa', 'https://www.youtube.com/results?search_query=x',
+                    'https://www.youtube.com/attribution_link?a=x&u=/watch%3Fv%3Dabc', 'https://www.youtube.com/'):
+            with self.subTest(url=url):
+                self.assertIsNone(youtube_id(url))
+
+
+class CanonicalUrlTest(unittest.TestCase):
+    def assertSameKey(self, *urls):
+        self.assertEqual(len({canonical_url(url) for url in urls}), 1, urls)
+
+    def test_youtube_variants(self):
+        self.assertSameKey('https://www.youtube.com/watch?v=dQw4w9WgXcQ&feature=share',
+                           'http://youtu.be/dQw4w9WgXcQ', 'https://m.youtube.com/shorts/dQw4w9WgXcQ/')
+        self.assertEqual(canonical_url('https://youtu.be/dQw4w9WgXcQ'), 'youtube:dQw4w9WgXcQ')
+
+    def test_youtube_non_video_urls_stay_distinct(self):
+        self.assertNotEqual(canonical_url('https://www.youtube.com/playlist?list=PLaaa'),
+                            canonical_url('https://www.youtube.com/playlist?list=PLbbb'))
+        self.assertNotEqual(canonical_url('https://www.youtube.com/results?search_query=a'),
+                            canonical_url('https://www.youtube.com/results?search_query=b'))
+
+    def test_youtube_channel(self):
+        self.assertEqual(canonical_url('https://www.youtube.com/channel/UC123/videos'), 'youtube-channel:UC123')
+
+    def test_media_hosts(self):
+        self.assertSameKey('https://gfycat.com/FooBar', 'https://thumbs.gfycat.com/FooBar-size_restricted.gif',
+                           'https://giant.gfycat.com/FooBar.webm')
+        self.assertSameKey('https://clips.twitch.tv/FunnyClip', 'https://www.twitch.tv/streamer/clip/FunnyClip')
+        self.assertSameKey('https://imgur.com/abc123', 'https://i.imgur.com/abc123.jpg')
+        self.assertSameKey('https://v.redd.it/abc123', 'https://v.redd.it/abc123/DASH_720.mp4')
+        self.assertSameKey('https://streamable.com/xyz', 'https://streamable.com/xyz/')
+
+    def test_generic_urls(self):
+        self.assertSameKey('https://www.example.com/page/?b=2&a=1&fbclid=x#top', 'http://example.com/page?a=1&b=2')
+        self.assertNotEqual(canonical_url('https://example.com/page?a=1'), canonical_url('https://example.com/page?a=2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import configparser
+import logging
+import socket
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from reddit.enums import Action, Rule
+from reddit.guard import ValidatorGuard
+
+ITEM = SimpleNamespace(id='abc123')
+
+
+def make_guard(**deadlines) -> ValidatorGuard:
+    config = configparser.ConfigParser()
+    config.read_dict({'deadlines': dict({'timeout': '0.2', 'quarantine_after': '2', 'quarantine_time': '0.3'},
+                                        **{key: str(value) for key, value in deadlines.items()})})
+    logger = logging.getLogger('tests.guard')
+    logger.disabled = True
+    return ValidatorGuard(config, logger)
+
+
+class PassValidator:
+    def __init__(self):
+        self.calls = 0
+
+    def validate(self, item):
+        self.calls += 1
+        return Action.PASS, Rule.NONE
+
+
+class HangValidator:
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def validate(self, item):
+        self.calls += 1
+        self.release.wait(5)
+        return Action.PASS, Rule.NONE
+
+
+class RaiseValidator:
+    def __init__(self, error=ValueError):
+        self.error = error
+        self.fail = True
+
+    def validate(self, item):
+        if self.fail:
+            raise self.error('boom')
+        return Action.APPROVE, Rule.NONE
+
+
+class InlineValidator(RaiseValidator):
+    pass
+
+
+class ValidatorGuardTest(unittest.TestCase):
+    def test_verdict(self):
+        self.assertEqual(make_guard().validate(PassValidator(), ITEM), (Action.PASS, Rule.NONE))
+
+    def test_timeout(self):
+        guard, validator = make_guard(), HangValidator()
+        self.assertEqual(guard.validate(validator, ITEM), (Action.MANUAL, Rule.NONE))
+        validator.release.set()
+        self.assertEqual(guard.stats()['HangValidator']['timeouts'], 1)
+
+    def test_raise(self):
+        guard = make_guard()
+        self.assertEqual(guard.validate(RaiseValidator(), ITEM), (Action.MANUAL, Rule.NONE))
+        self.assertEqual(guard.stats()['RaiseValidator']['errors'], 1)
+        self.assertEqual(guard.stats()['RaiseValidator']['timeouts'], 0)
+
+    def test_own_timeout_is_an_error(self):
+        for error in (TimeoutError, socket.timeout):
+            with self.subTest(error=error):
+                guard = make_guard()
+                self.assertEqual(guard.validate(RaiseValidator(error), ITEM), (Action.MANUAL, Rule.NONE))
+                self.assertEqual(guard.stats()['RaiseValidator']['errors'], 1)
+                self.assertEqual(guard.stats()['RaiseValidator']['timeouts'], 0)
+
+    def test_inline(self):
+        guard, validator = make_guard(inline_timeout=0), InlineValidator(TimeoutError)
+        self.assertEqual(guard.validate(validator, ITEM), (Action.MANUAL, Rule.NONE))
+        self.assertEqual(guard.stats()['InlineValidator']['errors'], 1)
+        validator.fail = False
+        self.assertEqual(guard.validate(validator, ITEM), (Action.APPROVE, Rule.NONE))
+
+    def test_quarantine_and_recovery(self):
+        guard, validator = make_guard(), RaiseValidator()
+        guard.validate(validator, ITEM)
+        guard.validate(validator, ITEM)
+        self.assertEqual(guard.stats()['RaiseValidator']['state'], 'open')
+
+        validator.fail = False
+        self.assertEqual(guard.validate(validator, ITEM), (Action.MANUAL, Rule.NONE))  # Skipped while quarantined
+        self.assertEqual(guard.stats()['RaiseValidator']['quarantined'], 1)
+
+        time.sleep(0.35)
+        self.assertEqual(guard.validate(validator, ITEM), (Action.APPROVE, Rule.NONE))  # Trial call succeeds
+        self.assertEqual(guard.stats()['RaiseValidator']['state'], 'closed')
+
+    def test_stuck(self):
+        guard, validator = make_guard(), HangValidator()
+        guard.validate(validator, ITEM)
+        self.assertEqual(guard.validate(validator, ITEM), (Action.MANUAL, Rule.NONE))
+        self.assertEqual(validator.calls, 1)  # Not called again while its first call still runs
+        self.assertEqual(guard.stats()['HangValidator']['stuck'], 1)
+
+        validator.release.set()
+        time.sleep(0.05)
+        self.assertEqual(guard.validate(validator, ITEM), (Action.PASS, Rule.NONE))
+
+    def test_busy(self):
+        guard = make_guard(threads=1, timeout=0.1)
+        hung, waiting = HangValidator(), PassValidator()
+        threading.Thread(target=guard.validate, args=(hung, ITEM)).start()
+        time.sleep(0.02)
+        self.assertEqual(guard.validate(waiting, ITEM), (Action.MANUAL, Rule.NONE))
+        hung.release.set()
+        time.sleep(0.05)
+
+        stats = guard.stats()['PassValidator']
+        self.assertEqual((stats['busy'], stats['timeouts'], stats['state']), (1, 0, 'closed'))
+        self.assertEqual(waiting.calls, 0)  # Cancelled, so it never runs after its fallback was used
+
+    def test_remove_fallback_rejected(self):
+        with self.assertRaises(ValueError):
+            make_guard(promotion_fallback='REMOVE')
+
+
+if __name__ == '__main__':
+    unittest.main()
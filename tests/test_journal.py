@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from reddit.enums import Action, Rule
+from reddit.journal import DecisionJournal, JournalReader, Record, Verdict, decode, encode, segment_name
+
+
+def make_record(item_id: str = 'abc123', timestamp: float = 1700000000.0) -> Record:
+    return Record(item_id, timestamp, 'submission', Action.REMOVE, [
+        Verdict('DomainValidator', Action.PASS, Rule.NONE, 0.001),
+        Verdict('PromotionValidator', Action.REMOVE, Rule.PROMOTION, 0.25),
+    ])
+
+
+class FrameTest(unittest.TestCase):
+    def test_round_trip(self):
+        record = make_record()
+        decoded = decode(encode(record), 4)
+        self.assertEqual(decoded[:4], record[:4])
+        self.assertEqual([verdict[:3] for verdict in decoded.verdicts], [verdict[:3] for verdict in record.verdicts])
+        for before, after in zip(record.verdicts, decoded.verdicts):
+            self.assertAlmostEqual(before.latency, after.latency, places=6)  # Stored as float32
+
+    def test_comment_without_verdicts(self):
+        record = Record('c0ffee', 1700000000.5, 'comment', Action.MANUAL, [])
+        self.assertEqual(decode(encode(record), 4), record)
+
+    def test_length_prefix(self):
+        frame = encode(make_record())
+        self.assertEqual(int.from_bytes(frame[:4], 'little'), len(frame) - 4)
+
+    def test_long_and_unicode_strings(self):
+        record = Record('x' * 300, 1700000000.0, 'submission', Action.PASS, [
+            Verdict('Validatör', Action.PASS, Rule.NONE, 0.0)
+        ])
+        decoded = decode(encode(record), 4)
+        self.assertEqual(decoded.id, 'x' * 255)  # Strings are cut to 255 bytes
+        self.assertEqual(decoded.verdicts[0].validator, 'Validatör')
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def write(self, *records: Record):
+        journal = DecisionJournal(self.path)
+        for record in records:
+            journal.record(record)
+        journal.close()
+
+    def test_read_back(self):
+        records = [make_record(f'id{i}', 1700000000.0 + i) for i in range(5)]
+        self.write(*records)
+        self.assertEqual([record.id for record in JournalReader(self.path).records()], [f'id{i}' for i in range(5)])
+
+    def test_truncated_trailing_frame(self):
+        self.write(make_record('first'), make_record('second'))
+        segment = os.path.join(self.path, segment_name(1700000000.0))
+        with open(segment, 'ab') as f:
+            f.write(encode(make_record('partial'))[:-3])
+
+        self.assertEqual([record.id for record in JournalReader.read_segment(segment)], ['first', 'second'])
+
+    def test_truncated_length_prefix(self):
+        self.write(make_record('first'))
+        segment = os.path.join(self.path, segment_name(1700000000.0))
+        with open(segment, 'ab') as f:
+            f.write(b'\x10\x00')
+
+        self.assertEqual([record.id for record in JournalReader.read_segment(segment)], ['first'])
+
+    def test_find(self):
+        self.write(make_record('abc'), make_record('abcd'), make_record('xabc'), make_record('abc', 1700000100.0),
+                   make_record('abc', 1700000000.0 + 86400 * 2))
+        reader = JournalReader(self.path)
+        self.assertEqual([record.time for record in reader.find('abc')],
+                         [1700000000.0, 1700000100.0, 1700000000.0 + 86400 * 2])
+        self.assertEqual(len(reader.find('abc', since=1700000050.0)), 2)
+        self.assertEqual(reader.find('missing'), [])
+
+    def test_empty_segment(self):
+        open(os.path.join(self.path, segment_name(time.time())), 'wb').close()
+        self.assertEqual(list(JournalReader(self.path).records()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
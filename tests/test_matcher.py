@@ -0,0 +1,89 @@
+import random
+import re
+import unittest
+
+from reddit.matcher import PatternSet
+
+
+class PhraseTest(unittest.TestCase):
+    def test_whole_words(self):
+        matcher = PatternSet()
+        matcher.add_phrase('ass', 'X')
+        self.assertEqual(matcher.search('first class'), [])
+        self.assertEqual(matcher.search('what an ASS!'), ['X'])
+        self.assertEqual(matcher.search('ass'), ['X'])
+
+    def test_substrings(self):
+        matcher = PatternSet(whole_words=False)
+        matcher.add_phrase('ass', 'X')
+        self.assertEqual(matcher.search('first class'), ['X'])
+
+    def test_fail_links(self):
+        # 'she' ends inside 'ushers', and 'he'/'hers' are only reachable through failure links
+        matcher = PatternSet(whole_words=False)
+        for phrase in ('he', 'she', 'his', 'hers'):
+            matcher.add_phrase(phrase, phrase)
+        self.assertEqual(sorted(matcher.search('ushers')), ['he', 'hers', 'she'])
+
+    def test_overlapping_phrases(self):
+        matcher = PatternSet()
+        matcher.add_phrase('free vbucks', 'X')
+        matcher.add_phrase('vbucks generator', 'Y')
+        self.assertEqual(sorted(matcher.search('free vbucks generator')), ['X', 'Y'])
+
+    def test_whole_word_after_partial_match(self):
+        matcher = PatternSet()
+        matcher.add_phrase('scam', 'X')
+        self.assertEqual(matcher.search('scams and a scam'), ['X'])
+
+    def test_against_brute_force(self):
+        rng = random.Random(0)
+        words = ['ab', 'abc', 'bca', 'b', 'cab', 'aa', 'ca b', 'bb c']
+        matcher = PatternSet(whole_words=False)
+        for word in words:
+            matcher.add_phrase(word, word)
+        for _ in range(200):
+            text = ''.join(rng.choice('abc ') for _ in range(rng.randint(0, 30)))
+            self.assertEqual(sorted(matcher.search(text)), sorted(word for word in words if word in text), text)
+
+    def test_phrases_added_after_search(self):
+        matcher = PatternSet()
+        matcher.add_phrase('foo', 'X')
+        self.assertEqual(matcher.search('bar'), [])
+        matcher.add_phrase('bar', 'Y')
+        self.assertEqual(matcher.search('bar'), ['Y'])
+
+
+class PatternTest(unittest.TestCase):
+    def test_overlapping_patterns(self):
+        matcher = PatternSet()
+        matcher.add_pattern(r'foo bar', 'X')
+        matcher.add_pattern(r'bar baz', 'Y')
+        self.assertEqual(sorted(matcher.search('foo bar baz')), ['X', 'Y'])
+
+    def test_same_position(self):
+        matcher = PatternSet()
+        matcher.add_pattern(r'free \w+', 'X')
+        matcher.add_pattern(r'free vbucks', 'Y')
+        self.assertEqual(sorted(matcher.search('FREE VBUCKS')), ['X', 'Y'])
+
+    def test_several_patterns_per_tag(self):
+        matcher = PatternSet()
+        matcher.add_pattern(r'bit\.ly/\w+', 'X')
+        matcher.add_pattern(r'discord\.gg/(\w+)', 'X')
+        self.assertEqual(matcher.search('join discord.gg/abc'), ['X'])
+        self.assertEqual(matcher.search('nothing here'), [])
+
+    def test_invalid_pattern(self):
+        with self.assertRaises(re.error):
+            PatternSet().add_pattern('(unclosed', 'X')
+
+    def test_phrases_and_patterns(self):
+        matcher = PatternSet()
+        matcher.add_phrase('giveaway', 'X')
+        matcher.add_pattern(r'\d{3,} vbucks', 'Y')
+        self.assertEqual(matcher.search('1000 vbucks giveaway'), ['X', 'Y'])
+
+
+if __name__ == '__main__':
+    unittest.main()
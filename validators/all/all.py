@@ -1,9 +1,9 @@
-from collections import deque
 from typing import Tuple
 
-import praw.models
-
+from reddit.budget import Priority
+from reddit.cache import BoundedCache
 from reddit.enums import Action, Rule
+from reddit.snapshot import SubmissionSnapshot
 from reddit.validator import SubmissionValidator
 
 
@@ -12,22 +12,24 @@ class AllValidator(SubmissionValidator):
 
     def __init__(self, reddit):
         super().__init__(reddit)
-        self._store = deque(maxlen=100)
+        self._store = BoundedCache('all.seen', max_items=100)
 
     def process(self):
-        for submission in self._praw.subreddit('all').hot(limit=25):
+        for submission in self.reddit.budget.reader(Priority.BACKGROUND).subreddit('all').hot(limit=25):
             if submission is None or (submission and submission.id in self._store):
                 continue
 
             if submission.subreddit.display_name.lower() in self.reddit.config.get('general', 'subreddits'):
                 self.dlog('Found post from {} in /r/all!'.format(submission.subreddit.display_name))
-                self._store.appendleft(submission.id)
-                if submission.flair_css_class:
-                    submission.mod.flair(text='r/all', css_class=submission.flair_css_class)
+                self._store[submission.id] = None
+                css_class = submission.link_flair_css_class
+                submission = self.reddit.budget.writer(Priority.BACKGROUND).submission(id=submission.id)
+                if css_class:
+                    submission.mod.flair(text='r/all', css_class=css_class)
                 else:
                     submission.mod.flair(text='r/all')
 
-    def validate(self, submission: praw.models.Submission) -> Tuple[Action, Rule]:
+    def validate(self, submission: SubmissionSnapshot) -> Tuple[Action, Rule]:
         return Action.PASS, Rule.NONE
 
 
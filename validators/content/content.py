@@ -0,0 +1,69 @@
+import os
+from typing import Tuple
+
+from reddit.enums import Action, Rule
+from reddit.matcher import PatternSet
+from reddit.snapshot import Snapshot
+from reddit.validator import Validator
+
+SEVERITY = [Action.REMOVE, Action.MANUAL, Action.APPROVE, Action.PASS]
+
+
+class ContentValidator(Validator):
+    """Check titles, self text and comments against phrase and pattern lists from the config.
+
+    Every section other than [general] is a list. All lists are compiled into one :class:`PatternSet`, so each item
+    is scanned once no matter how many phrases are configured. When several lists match, the most severe action wins.
+    """
+    __slots__ = ['_matcher', '_lists']
+
+    def __init__(self, reddit):
+        super().__init__(reddit)
+        self._matcher = PatternSet(whole_words=self.config.getboolean('general', 'whole_words', fallback=True))
+        self._lists = {}
+
+        phrases, patterns = 0, 0
+        for section in self.config.sections():
+            if section == 'general':
+                continue
+
+            self._lists[section] = (
+                Action[self.config.get(section, 'action', fallback='REMOVE').upper()],
+                Rule[self.config.get(section, 'rule', fallback='CONTENT').upper()]
+            )
+
+            lines = self.config.get(section, 'phrases', raw=True, fallback='').splitlines()
+            if self.config.has_option(section, 'phrase_file'):
+                path = os.path.join(os.path.dirname(__file__), self.config.get(section, 'phrase_file', raw=True))
+                with open(path, encoding='utf-8') as f:
+                    lines.extend(f.read().splitlines())
+            for phrase in lines:
+                if phrase.strip():
+                    self._matcher.add_phrase(phrase, section)
+                    phrases += 1
+
+            for pattern in self.config.get(section, 'patterns', raw=True, fallback='').splitlines():
+                if pattern.strip():
+                    self._matcher.add_pattern(pattern.strip(), section)
+                    patterns += 1
+
+        self._matcher.build()
+        self.ilog(f'Loaded {phrases} phrases and {patterns} patterns from {len(self._lists)} lists.')
+
+    def validate(self, item: Snapshot) -> Tuple[Action, Rule]:
+        if item.kind == 'comment':
+            text = item.body
+        else:
+            text = item.title + '\n' + (item.selftext or '') + '\n' + (item.url if not item.is_self else '')
+
+        matches = self._matcher.search(text)
+        if not matches:
+            return Action.PASS, Rule.NONE
+
+        action, rule = min((self._lists[match] for match in matches), key=lambda verdict: SEVERITY.index(verdict[0]))
+        self.dlog(f'Matched content lists: {", ".join(matches)}')
+        return action, rule
+
+
+def setup(reddit):
+    reddit.add_extension(ContentValidator(reddit))
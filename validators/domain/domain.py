@@ -1,8 +1,7 @@
-from praw.models import Submission
-
 from typing import Tuple
 
 from reddit.enums import Rule, Action
+from reddit.snapshot import SubmissionSnapshot
 from reddit.validator import SubmissionValidator
 
 
@@ -13,7 +12,7 @@ class DomainValidator(SubmissionValidator):
         super().__init__(reddit)
         self.domains = dict(reddit.config.items('domains'))
 
-    def validate(self, submission: Submission) -> Tuple[Action, Rule]:
+    def validate(self, submission: SubmissionSnapshot) -> Tuple[Action, Rule]:
         if submission.is_self:
             return Action.PASS, Rule.NONE
         elif any(host in submission.url for host in self.domains['approved'].split(',')):
@@ -1,15 +1,23 @@
-from collections import deque
-import queue
 from time import time
-from namedlist import namedlist
 from typing import Tuple
 
-from praw.models import Submission
-
+from reddit.budget import Priority
+from reddit.cache import BoundedCache
 from reddit.enums import Rule, Action
+from reddit.snapshot import SubmissionSnapshot
 from reddit.validator import SubmissionValidator
 
-WatchedSubmission = namedlist('WatchedSubmission', [('id', ''), ('created', 0.0), ('warned', False)])
+class WatchedSubmission:
+    """An unflaired submission waiting to be warned about or removed."""
+    __slots__ = ['id', 'created', 'warned']
+
+    def __init__(self, id: str = '', created: float = 0.0, warned: bool = False):
+        self.id = id
+        self.created = created
+        self.warned = warned
+
+    def __repr__(self):
+        return f'WatchedSubmission(id={self.id!r}, created={self.created!r}, warned={self.warned!r})'
 
 
 class FlairValidator(SubmissionValidator):
@@ -18,26 +26,19 @@ class FlairValidator(SubmissionValidator):
 
     def __init__(self, reddit):
         super().__init__(reddit)
-        self._store = deque()
-        self._queue = queue.Queue()
+        self._store = BoundedCache('flair.watched', max_items=self.config.getint('general', 'max_watched', fallback=10000))
 
     def process(self):
-        while True:
-            try:
-                submission = self._queue.get(block=False)
-            except queue.Empty:
-                break
-            else:
-                self._store.appendleft(submission)
-
-        self._store = deque(submission for submission in self._store if self.check(submission))
+        for submission_id, submission in self._store.items():
+            if not self.check(submission):
+                self._store.pop(submission_id, None)
 
     def check(self, watched_submission: WatchedSubmission) -> bool:
         elapsed_time = time() - watched_submission.created
         if elapsed_time < self.config.getint('general', 'warn_time'):
             return True  # We can avoid unnecessary requests by checking first!
 
-        submission = self._praw.submission(id=watched_submission.id)
+        submission = self.reddit.budget.reader(Priority.METADATA).submission(id=watched_submission.id)
 
         if not submission or (submission and not submission.author):
             self.dlog(f'Failed to retrieve submission from store! {watched_submission}')
@@ -45,7 +46,7 @@ class FlairValidator(SubmissionValidator):
 
         if not watched_submission.warned and submission.link_flair_text is None:
             self.dlog('Warning user about an unflaired post!')
-            author = submission.author
+            author = self.reddit.budget.writer(Priority.METADATA).redditor(submission.author.name)
             author.message(
                 self.config.get('message', 'subject'),
                 self.config.get('message', 'body')
@@ -55,6 +56,7 @@ class FlairValidator(SubmissionValidator):
             return True
         elif elapsed_time >= self.config.getint('general', 'remove_time') and submission.link_flair_text is None:
             self.dlog('Removing an unflaired post!')
+            submission = self.reddit.budget.writer(Priority.REMOVAL).submission(id=watched_submission.id)
             submission.reply(str(Rule.FLAIR)).mod.distinguish()
             submission.mod.remove()
             return False
@@ -63,10 +65,9 @@ class FlairValidator(SubmissionValidator):
 
         return True
 
-    def validate(self, submission: Submission) -> Tuple[Action, Rule]:
-        if submission.link_flair_text is None:
-            watch = WatchedSubmission(submission.id, submission.created_utc, False)
-            self._queue.put(watch)
+    def validate(self, submission: SubmissionSnapshot) -> Tuple[Action, Rule]:
+        if submission.link_flair_text is None and submission.id not in self._store:
+            self._store[submission.id] = WatchedSubmission(submission.id, submission.created_utc, False)
             self.dlog('Storing submission for later processing...')
 
         return Action.PASS, Rule.NONE  # We can't actually make a judgement yet
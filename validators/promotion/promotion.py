@@ -1,32 +1,53 @@
-from typing import Tuple
-from urllib.parse import urlparse, parse_qs
+from typing import Optional, Tuple
 
 import isodate
 import requests
-from praw.models import Submission
 
+from reddit.canonical import youtube_id
 from reddit.enums import Rule, Action
+from reddit.snapshot import SubmissionSnapshot
 from reddit.validator import SubmissionValidator
 
 
+def read_fallback(config) -> Action:
+    """Get the verdict used when YouTube or PushShift cannot be reached."""
+    action = Action[config.get('general', 'fallback', fallback='MANUAL').upper()]
+    if action == Action.REMOVE:
+        raise ValueError('Promotion fallback cannot be REMOVE, there would be no rule to give as the removal reason')
+    return action
+
+
 class YoutubeValidator(SubmissionValidator):
-    __slots__ = ['api']
+    __slots__ = ['api', 'fallback']
 
     def __init__(self, reddit):
         super().__init__(reddit)
         self.api = 'https://www.googleapis.com/youtube/v3/videos?id={id}&key={key}&part=contentDetails'
+        self.fallback = read_fallback(self.config)
+
+    def validate(self, submission: SubmissionSnapshot) -> Tuple[Action, Rule]:
+        verdict = self.check(submission)
+        return verdict if verdict is not None else (self.fallback, Rule.NONE)
 
-    def validate(self, submission: Submission) -> Tuple[Action, Rule]:
+    def check(self, submission: SubmissionSnapshot) -> Optional[Tuple[Action, Rule]]:
+        """Check the length of a YouTube video. Returns None if YouTube could not be reached."""
         if any(url in submission.url for url in self.config.get('youtube', 'domains').split(',')):
             if 'channel' in submission.url or 'live' in submission.url:
                 return Action.REMOVE, Rule.PROMOTION
             else:
                 video_id = self.get_id(submission.url)
-                response = requests.get(self.api.format(id=video_id, key=self.config.get('youtube', 'api')))
-                if 300 > response.status_code >= 200:
-                    data = response.json()
-                else:
-                    raise ConnectionError
+                if video_id is None:  # Not a single video (playlist, search, ...), there is no duration to check
+                    return Action.APPROVE, Rule.NONE
+
+                try:
+                    with self.reddit.http.get(self.api.format(id=video_id, key=self.config.get('youtube', 'api'))) as r:
+                        if not 300 > r.status_code >= 200:
+                            self.dlog(f'YouTube responded with {r.status_code}.')
+                            return None
+                        data = r.json()
+                except requests.RequestException as error:
+                    self.dlog(f'YouTube unavailable. ({error})')
+                    return None
 
                 try:
                     duration = isodate.parse_duration(data['items'][0]['contentDetails']['duration']).total_seconds()
@@ -42,21 +63,20 @@ class YoutubeValidator(SubmissionValidator):
 
     @staticmethod
     def get_id(url):
-        u_pars = urlparse(url)
-        query_v = parse_qs(u_pars.query).get('v')
-        if query_v:
-            return query_v[0]
-        pth = u_pars.path.split('/')
-        if pth:
-            return pth[-1]
+        return youtube_id(url)
 
 
 class PushShift:
+    __slots__ = ['http']
+
     API = 'https://api.pushshift.io/reddit'
 
     COMMENT_API = API + '/search/comment'
     SUBMISSION_API = API + '/search/submission'
 
+    def __init__(self, http):
+        self.http = http
+
     def comment_count(self, author: str, subreddit: str) -> int:
         """Get the number of comments made by a Redditor(s) on a subreddit(s).
 
@@ -71,26 +91,32 @@ class PushShift:
         -------
         int
             Total count of all comments for the given author(s) and subreddit(s).
-            Returns -1 if request failed.
+            Returns -1 if request failed or PushShift is unavailable.
         """
-        with requests.get(self.COMMENT_API + f'?author={author}&subreddit={subreddit}&aggs=subreddit&size=0') as r:
-            if 300 > r.status_code >= 200:
-                json = r.json()
-            else:
-                return -1
+        try:
+            with self.http.get(self.COMMENT_API + f'?author={author}&subreddit={subreddit}&aggs=subreddit&size=0') as r:
+                if 300 > r.status_code >= 200:
+                    json = r.json()
+                else:
+                    return -1
+        except requests.RequestException:
+            return -1
 
         return sum(subreddit['doc_count'] for subreddit in json['aggs']['subreddit'])
 
 
 class PromotionValidator(SubmissionValidator):
-    __slots__ = ['video', 'youtube', 'push_shift']
+    __slots__ = ['video', 'youtube', 'push_shift', 'fallback']
+
+    cheap = False
 
     def __init__(self, reddit):
         super().__init__(reddit)
         self.youtube = YoutubeValidator(reddit)
-        self.push_shift = PushShift()
+        self.push_shift = PushShift(reddit.http)
+        self.fallback = read_fallback(self.config)
 
-    def validate(self, submission: Submission) -> Tuple[Action, Rule]:
+    def validate(self, submission: SubmissionSnapshot) -> Tuple[Action, Rule]:
         if not any(url in submission.url for url in self.reddit.config.get('domains', 'watched').split(',')):
             return Action.PASS, Rule.NONE
         elif any(url in submission.url for url in self.reddit.config.get('domains', 'approved').split(',')):
@@ -104,8 +130,15 @@ class PromotionValidator(SubmissionValidator):
         subs = ','.join([sub.split('-')[0] for sub in self.reddit.config.get('general', 'subreddits').split('+')])
         count = self.push_shift.comment_count(submission.author, subs)
 
-        if count < self.config.getint('general', 'comment_limit'):
-            if self.youtube.validate(submission)[0] == Action.REMOVE:
+        if count < 0:
+            self.dlog('PushShift unavailable, using fallback verdict.')
+            return self.fallback, Rule.NONE
+        elif count < self.config.getint('general', 'comment_limit'):
+            verdict = self.youtube.check(submission)
+            if verdict is None:
+                self.dlog('YouTube unavailable, using fallback verdict.')
+                return self.fallback, Rule.NONE
+            elif verdict[0] == Action.REMOVE:
                 self.ilog(f'Removing video longer than {self.config.getfloat("general", "time_limit")} seconds.')
                 return Action.REMOVE, Rule.PROMOTION
             else:
@@ -0,0 +1,134 @@
+import sqlite3
+import threading
+from time import time
+from typing import Optional, Tuple
+
+import prawcore
+
+from reddit.budget import Priority
+from reddit.cache import BoundedCache
+from reddit.canonical import canonical_url
+from reddit.enums import Action, Rule
+from reddit.snapshot import SubmissionSnapshot
+from reddit.validator import SubmissionValidator
+
+
+class RepostIndex:
+    """Time-windowed index of recently submitted links, keyed by canonical url.
+
+    The most recent links are kept in memory. Older ones, and every new link once :meth:`flush` is called, are
+    spilled to SQLite so the index survives restarts without holding the whole window in memory.
+    """
+    __slots__ = ['window', 'memory_size', '_recent', '_pending', '_db', '_lock']
+
+    def __init__(self, path: str, window: float, memory_size: int):
+        self.window = window
+        self.memory_size = memory_size
+        self._recent = BoundedCache('repost.recent', max_items=memory_size, ttl=window)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('CREATE TABLE IF NOT EXISTS links (key TEXT PRIMARY KEY, id TEXT, created REAL)')
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Get the id and creation time of the first submission of a link within the window."""
+        oldest = time() - self.window
+        with self._lock:
+            found = self._recent.get(key)
+            if found is None:
+                found = self._db.execute('SELECT id, created FROM links WHERE key = ?', (key,)).fetchone()
+        if found and found[1] >= oldest:
+            return found[0], found[1]
+        return None
+
+    def add(self, key: str, submission_id: str, created: float):
+        with self._lock:
+            self._recent[key] = (submission_id, created)
+            self._pending.append((key, submission_id, created))
+            if len(self._pending) >= self.memory_size:
+                self._spill()
+
+    def discard(self, key: str):
+        """Forget a link, i.e because its first submission is gone."""
+        with self._lock:
+            self._recent.pop(key, None)
+            self._pending = [pending for pending in self._pending if pending[0] != key]
+            self._db.execute('DELETE FROM links WHERE key = ?', (key,))
+            self._db.commit()
+
+    def _spill(self):
+        self._db.executemany('INSERT OR REPLACE INTO links VALUES (?, ?, ?)', self._pending)
+        self._db.commit()
+        self._pending = []
+
+    def flush(self):
+        """Write new links to the database and forget links older than the window."""
+        oldest = time() - self.window
+        with self._lock:
+            self._spill()
+            self._db.execute('DELETE FROM links WHERE created < ?', (oldest,))
+            self._db.commit()
+            self._recent.expire()
+
+
+class RepostValidator(SubmissionValidator):
+    """Flag links that were already submitted within the configured window.
+
+    Links are compared by canonical url, so youtu.be and youtube.com links to the same video (or gfycat variants,
+    clip links, ...) are caught without calling any external API. Load this before validators that do.
+
+    A link is only indexed once its submission was not removed by the bot, and a match is checked against Reddit
+    before it counts, so a link whose first submission was removed or deleted since can be posted again.
+    """
+    __slots__ = ['index', 'action']
+
+    def __init__(self, reddit):
+        super().__init__(reddit)
+        self.action = Action[self.config.get('general', 'action', fallback='REMOVE').upper()]
+        self.index = RepostIndex(
+            self.config.get('general', 'database', fallback='data/repost.db'),
+            self.config.getfloat('general', 'window', fallback=7 * 24 * 60 * 60),
+            self.config.getint('general', 'memory_size', fallback=5000)
+        )
+
+    def process(self):
+        self.index.flush()
+
+    def validate(self, submission: SubmissionSnapshot) -> Tuple[Action, Rule]:
+        if submission.is_self:
+            return Action.PASS, Rule.NONE
+
+        key = canonical_url(submission.url)
+        original = self.index.get(key)
+        if original and original[0] != submission.id:
+            if not self.available(original[0]):
+                self.dlog(f'Original submission {original[0]} of {key} is gone, forgetting it.')
+                self.index.discard(key)
+                return Action.PASS, Rule.NONE
+
+            self.dlog(f'Found repost of {original[0]} ({key})!')
+            return self.action, Rule.REPOST
+
+        return Action.PASS, Rule.NONE
+
+    def available(self, submission_id: str) -> bool:
+        """Check whether a submission is still up. Assumes it is if Reddit cannot be reached."""
+        try:
+            submission = self.reddit.budget.reader(Priority.METADATA).submission(id=submission_id)
+            return submission.author is not None and not getattr(submission, 'removed_by_category', None)
+        except prawcore.PrawcoreException as error:
+            self.dlog(f'Unable to look up {submission_id}, assuming it is still up. ({error})')
+            return True
+
+    def decided(self, submission: SubmissionSnapshot, outcome: Action):
+        if outcome == Action.REMOVE or submission.is_self:
+            return
+
+        key = canonical_url(submission.url)
+        if self.index.get(key) is None:
+            self.index.add(key, submission.id, submission.created_utc)
+
+
+def setup(reddit):
+    reddit.add_extension(RepostValidator(reddit))
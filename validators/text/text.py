@@ -1,11 +1,10 @@
-from praw.models import Submission
-
 from reddit.enums import Rule, Action
+from reddit.snapshot import SubmissionSnapshot
 from reddit.validator import SubmissionValidator
 
 
 class TextValidator(SubmissionValidator):
-    def validate(self, submission: Submission):
+    def validate(self, submission: SubmissionSnapshot):
         if submission.is_self:
             return Action.APPROVE, Rule.NONE
 